@@ -1,15 +1,45 @@
 from importlib.metadata import PackageNotFoundError, version
 
 from anac.core.api import Api as api
+from anac.core.blocking import BlockingApi as blocking_api
+from anac.core.cache import ResponseCache
 from anac.core.exceptions import (
+    BulkError,
+    GraphQLError,
     raise_for_status,
     RequestDataError,
     RequestParamsError,
 )
+from anac.core.metrics import Metrics, OpenTelemetryHook
+from anac.core.ratelimit import RateLimiter
+from anac.core.retry import RetryPolicy
+from anac.core.snapshot import export_snapshot
+from anac.core.watermark import (
+    JSONWatermarkStore,
+    MemoryWatermarkStore,
+    SQLiteWatermarkStore,
+)
 
 try:
     __version__ = version(__name__)
 except PackageNotFoundError:
     __version__ = "unknown"
 
-__all__ = ("api", "RequestDataError", "RequestParamsError", "raise_for_status")
+__all__ = (
+    "api",
+    "blocking_api",
+    "BulkError",
+    "export_snapshot",
+    "GraphQLError",
+    "JSONWatermarkStore",
+    "MemoryWatermarkStore",
+    "Metrics",
+    "OpenTelemetryHook",
+    "RequestDataError",
+    "RequestParamsError",
+    "raise_for_status",
+    "RateLimiter",
+    "ResponseCache",
+    "RetryPolicy",
+    "SQLiteWatermarkStore",
+)
@@ -1,16 +1,37 @@
-import re
-from typing import Any, Dict, TypeVar
+import asyncio
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional, TypeVar
 
 import httpx
 from pydantic.dataclasses import dataclass
 
-from .endpoint import Endpoint
+from .cache import CacheKey, ResponseCache
+from .decoder import get_loads
+from .endpoint import DictAttribute, Endpoint
 from .exceptions import raise_for_status
+from .graphql import graphql_query, graphql_query_all
+from .metrics import RequestEvent
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .spec import SpecCache
 
 A = TypeVar("A", bound="Api")
 
+ENDPOINT_NAME_TABLE = str.maketrans({"{": None, "}": None, "-": "_", "/": "_"})
 
-@dataclass
+
+def endpoint_name(endpoint: str) -> str:
+    """Get Api attribute name for NetBox API endpoint
+    ('/dcim/devices/{id}/' -> 'dcim_devices_id')"""
+    return endpoint[1:-1].translate(ENDPOINT_NAME_TABLE)
+
+
+class Config:
+    arbitrary_types_allowed = True
+
+
+@dataclass(config=Config)
 class Api:
     """The initial API object.
 
@@ -22,6 +43,36 @@ class Api:
     Args:
         url (str): NetBox url
         token (str): NetBox API token
+        cache_dir (pathlib.Path): Directory for the on-disk openapi spec cache.
+            The cached spec is revalidated with NetBox version from '/api/status/'
+            or with 'ETag'/'Last-Modified' http headers. Disabled by default
+        lazy (bool): Create Endpoint objects on first attribute access instead of
+            creating all of them in openapi() coroutine. Only the endpoints index
+            and the version of the openapi spec are kept, there is no 'open_api'
+            attribute. Tab autocompletion works in both modes
+        json_decoder (str): JSON decoder for http responses: 'orjson', 'msgspec'
+            or 'json'. By default, the fastest installed decoder is used
+        max_connections (int): Max number of connections in the connection pool
+        max_keepalive_connections (int): Max number of idle keep-alive connections
+        keepalive_expiry (float): Idle keep-alive connection expiry, in seconds
+        http2 (bool): Enable HTTP/2. Requires 'h2' package (pip install httpx[http2])
+        connect_timeout (float): Default connect timeout for http requests
+        read_timeout (float): Default read timeout for http requests
+        transport (httpx.AsyncBaseTransport): Custom httpx transport
+        client (httpx.AsyncClient): Custom httpx.AsyncClient. If it is set,
+            the connection pool, timeout and transport arguments are ignored,
+            and Api does not close it
+        retry (anac.RetryPolicy): Retry policy for Endpoint* http requests.
+            Disabled by default
+        rate_limiter (anac.RateLimiter): Client-side rate limiter, shared by all
+            Endpoint* http requests, including retries. Disabled by default
+        cache (anac.ResponseCache): TTL/LRU cache for Endpoint* GET http requests.
+            Disabled by default
+        coalesce (bool): Send one http request for identical Endpoint* GET http
+            requests, running at the same time, and share its result
+        hooks (list): Functions, called with anac.core.metrics.RequestEvent after
+            each Endpoint* http request (anac.Metrics, anac.OpenTelemetryHook or
+            your own functions). Disabled by default
 
     Returns:
         Api object
@@ -41,16 +92,74 @@ class Api:
 
     url: str
     token: str
+    cache_dir: Optional[Path] = None
+    lazy: bool = False
+    json_decoder: Optional[Literal["orjson", "msgspec", "json"]] = None
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    http2: bool = False
+    connect_timeout: Optional[float] = 5.0
+    read_timeout: Optional[float] = 5.0
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    client: Optional[httpx.AsyncClient] = None
+    retry: Optional[RetryPolicy] = None
+    rate_limiter: Optional[RateLimiter] = None
+    cache: Optional[ResponseCache] = None
+    coalesce: bool = False
+    hooks: Optional[List[Callable[[RequestEvent], Any]]] = None
 
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    def __getattr__(self, name: str) -> Endpoint:
+        endpoints = self.__dict__.get("endpoints")
+        if endpoints is None or name not in endpoints:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        endpoint = Endpoint(self, self.base_url, endpoints[name])
+        self.__dict__[name] = endpoint
+        return endpoint
+
+    def __dir__(self) -> List[str]:
+        return sorted({*super().__dir__(), *self.__dict__.get("endpoints", ())})
+
     def __post_init_post_parse__(self) -> None:
 
-        self.http_session = httpx.AsyncClient()
+        self.own_http_session = self.client is None
+        self.http_session = self.client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                5.0, connect=self.connect_timeout, read=self.read_timeout
+            ),
+            http2=self.http2,
+            transport=self.transport,
+        )
+
+        self.loads = get_loads(self.json_decoder)
+
+        # openapi spec version ('4.0.3 (4.0)'), set by openapi()
+        self.spec_version: Optional[str] = None
+
+        self.in_flight: Dict[CacheKey, "asyncio.Future[Any]"] = {}
 
         self.base_url = f"{self.url if self.url[-1] != '/' else self.url[:-1]}/api"
 
+        # the same http headers for all Endpoint* http requests
+        self.read_headers = {
+            "authorization": f"Token {self.token}",
+            "accept": "application/json;",
+        }
+        self.write_headers = {
+            "authorization": f"Token {self.token}",
+            "Content-Type": "application/json;",
+        }
+
     async def get_openapi(self, timeout: float) -> Dict[str, Any]:
         headers = {
             "Content-Type": "application/json;",
@@ -61,9 +170,69 @@ class Api:
             timeout=timeout,
         )
 
-        raise_for_status(req)
+        raise_for_status(req, loads=self.loads)
+
+        return self.loads(req.content)
+
+    async def get_version(self, timeout: float) -> Optional[str]:
+        """Get NetBox version from '/api/status/' (NetBox 2.10+).
+        Returns None, if NetBox has no '/api/status/' endpoint"""
+        req = await self.http_session.get(
+            f"{self.base_url}/status/",
+            headers=self.read_headers,
+            timeout=timeout,
+        )
+        if not req.is_success:
+            return None
+        try:
+            return self.loads(req.content).get("netbox-version")
+        except (JSONDecodeError, AttributeError):
+            return None
+
+    async def get_cached_openapi(
+        self, timeout: float, cache_dir: Path
+    ) -> Dict[str, Any]:
+        """Get openapi spec from the on-disk cache (see 'cache_dir' argument).
+
+        The cached spec is used as is, if NetBox version is not changed.
+        If NetBox version is unknown, the spec is revalidated with
+        'If-None-Match'/'If-Modified-Since' http headers.
+        Otherwise the spec is downloaded and saved to the cache.
+        """
+        cache = SpecCache(cache_dir, self.base_url, loads=self.loads)
+        cached = cache.load()
+        version = await self.get_version(timeout=timeout)
+
+        if cached and version and cached["version"] == version:
+            return cached["spec"]
+
+        headers = {
+            "Content-Type": "application/json;",
+        }
+        if cached and not version:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        req = await self.http_session.get(
+            f"{self.base_url}/docs/?format=openapi",
+            headers=headers,
+            timeout=timeout,
+        )
+        if req.status_code == 304 and cached:
+            return cached["spec"]
+
+        raise_for_status(req, loads=self.loads)
 
-        return req.json()
+        spec = self.loads(req.content)
+        cache.save(
+            spec,
+            version=version,
+            etag=req.headers.get("etag"),
+            last_modified=req.headers.get("last-modified"),
+        )
+        return spec
 
     async def openapi(self, timeout: float = 50.0) -> None:
         """Get openapi spec and create attributes/endpoints
@@ -72,6 +241,9 @@ class Api:
         Args:
             timeout (float): Timeout for openapi http request
 
+        If Api 'cache_dir' argument is set, the openapi spec is taken
+        from the on-disk cache, see Api.get_cached_openapi.
+
         Returns:
             N/A
 
@@ -89,15 +261,134 @@ class Api:
                ...: )
                ...: await a.openapi()
         """
-        self.open_api = await self.get_openapi(timeout=timeout)
-
-        for endpoint in self.open_api["paths"].keys():
-            setattr(
-                self,
-                re.sub(r"[-/]", "_", re.sub(r"[{}]", "", endpoint[1:-1])),
-                Endpoint(self, self.base_url, endpoint),
+        if self.cache_dir is None:
+            spec = await self.get_openapi(timeout=timeout)
+        else:
+            spec = await self.get_cached_openapi(
+                timeout=timeout, cache_dir=self.cache_dir
             )
 
+        self.spec_version = spec.get("info", {}).get("version")
+        self.endpoints: Dict[str, str] = {
+            endpoint_name(endpoint): endpoint for endpoint in spec["paths"]
+        }
+
+        # the lazy Api keeps only the endpoints index of the openapi spec
+        if not self.lazy:
+            self.open_api = spec
+            for name, endpoint in self.endpoints.items():
+                setattr(self, name, Endpoint(self, self.base_url, endpoint))
+
+    async def graphql(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> DictAttribute:
+        """Send GraphQL query to NetBox GraphQL API ('/graphql/', NetBox 3.0+)
+
+        One GraphQL query gets nested NetBox objects (devices with their
+        interfaces and IP addresses, ...) in one http request instead of
+        many REST API http requests. The query is sent over Api.http_session
+        with Api retry, rate_limiter and hooks, the same as Endpoint* GET
+        http requests. openapi() is not required.
+
+        Args:
+            query (str): GraphQL query
+            variables (dict): GraphQL query variables
+
+        Returns:
+            DictAttribute class object: 'data' of GraphQL response. The nested
+            values are available as attributes, like EndpointId attributes
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            GraphQLError: If GraphQL response contains 'errors'
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+
+            In [2]: data = await a.graphql(
+               ...:     '''
+               ...:     query ($name: [String]) {
+               ...:       device_list(name: $name) {
+               ...:         name
+               ...:         interfaces { name ip_addresses { address } }
+               ...:       }
+               ...:     }
+               ...:     ''',
+               ...:     variables={"name": ["test"]},
+               ...: )
+
+            In [3]: data.device_list[0].interfaces[0].ip_addresses[0].address
+            Out[3]: '10.0.0.1/24'
+        """
+        return await graphql_query(self, query, variables)
+
+    async def graphql_all(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        field: Optional[str] = None,
+        limit: int = 100,
+        concurrency: int = 4,
+    ) -> List[DictAttribute]:
+        """Get all objects of GraphQL list field page by page.
+
+        The query must take '$offset' and '$limit' variables and pass them
+        to the list field pagination arguments ('offset: $offset, limit: $limit'
+        or 'pagination: {offset: $offset, limit: $limit}' for NetBox 4.0+). The total number of objects
+        is unknown, so 'concurrency' pages are requested at once over
+        Api.http_session, until a page has less than 'limit' objects.
+
+        Args:
+            query (str): GraphQL query with '$offset' and '$limit' variables
+            variables (dict): The other GraphQL query variables
+            field (str): GraphQL list field name ('device_list', ...). It may be
+                omitted, if the query has one field
+            limit (int): Page size
+            concurrency (int): Max number of concurrent http requests
+
+        Returns:
+            list with DictAttribute class objects
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            GraphQLError: If GraphQL response contains 'errors'
+            ValueError: For invalid 'limit' or if 'field' is omitted for the query
+                with many fields
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+
+            In [2]: devices = await a.graphql_all(
+               ...:     '''
+               ...:     query ($offset: Int!, $limit: Int!) {
+               ...:       device_list(offset: $offset, limit: $limit) {
+               ...:         name
+               ...:         interfaces { name ip_addresses { address } }
+               ...:       }
+               ...:     }
+               ...:     ''',
+               ...:     limit=500,
+               ...: )
+
+            In [3]: len(devices)
+            Out[3]: 8000
+        """
+        return await graphql_query_all(
+            self, query, variables, field, limit, concurrency
+        )
+
     async def aclose(self) -> None:
         """Close httpx.AsyncClient()
 
@@ -113,7 +404,8 @@ class Api:
 
             In [2]: await a.aclose()
         """
-        await self.http_session.aclose()
+        if self.own_http_session:
+            await self.http_session.aclose()
 
     async def __aenter__(self: A) -> A:
         """Use Api as a context manager
@@ -135,4 +427,4 @@ class Api:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        await self.http_session.aclose()
+        await self.aclose()
@@ -0,0 +1,174 @@
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Coroutine, Iterator, Optional, TypeVar
+
+from .api import Api
+from .endpoint import Endpoint
+
+T = TypeVar("T")
+
+
+class BlockingApi:
+    """Synchronous, thread-safe facade of Api
+
+    One event loop runs in a background thread for the whole BlockingApi life,
+    so the Api connection pool and openapi spec are created once and shared
+    by all synchronous callers (threads). Each call blocks until the coroutine
+    is done in the background event loop.
+
+    Endpoint methods are blocking, Endpoint.stream is a generator. The other
+    coroutines (EndpointId(...), EndpointAsIterator.run(), ...) are run
+    with BlockingApi.run().
+
+    Args:
+        args, kwargs: Api arguments
+        timeout (float): Timeout of openapi http request
+
+    Usage:
+        In [1]: from anac import blocking_api
+           ...:
+           ...: a = blocking_api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...: )
+
+        In [2]: test_device = a.dcim_devices(get={"name": "test"})
+
+        In [3]: test_device.name
+        Out[3]: 'test'
+
+        In [4]: test_device = a.run(test_device(patch={"name": "test1"}))
+
+        In [5]: for ip in a.ipam_ip_addresses.stream(get={"vrf_id": 1}):
+           ...:     print(ip.address)
+        10.0.0.1/24
+        10.0.0.2/24
+
+        In [6]: a.close()
+    """
+
+    def __init__(self, *args: Any, timeout: float = 50.0, **kwargs: Any) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="anac", daemon=True
+        )
+        self.thread.start()
+        try:
+            self.api: Api = self.run(self._open(timeout, *args, **kwargs))
+        except BaseException:
+            self._stop()
+            raise
+
+    async def _open(self, timeout: float, *args: Any, **kwargs: Any) -> Api:
+        # httpx.AsyncClient is created in the background event loop
+        a = Api(*args, **kwargs)
+        await a.openapi(timeout=timeout)
+        return a
+
+    def __repr__(self) -> str:
+        return self.__class__.__name__
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("api", "loop", "thread"):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            )
+        value = getattr(self.api, name)
+        if isinstance(value, Endpoint):
+            return BlockingEndpoint(self, value)
+        if inspect.iscoroutinefunction(value):
+            return self.blocking(value)
+        return value
+
+    def __dir__(self) -> Any:
+        return sorted({*super().__dir__(), *dir(self.api)})
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run coroutine in the background event loop and wait for its result.
+        It is safe to call run() from many threads"""
+        if self.loop.is_closed():
+            coro.close()
+            raise RuntimeError("BlockingApi is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def blocking(self, func: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., T]:
+        """Get blocking function for coroutine function"""
+
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return self.run(func(*args, **kwargs))
+
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def iterate(self, agen: Any) -> Iterator[Any]:
+        """Get generator for async generator"""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self.loop.is_closed():
+                self.run(agen.aclose())
+
+    def _stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def close(self) -> None:
+        """Close Api and stop the background event loop"""
+        if self.loop.is_closed():
+            return
+        try:
+            self.run(self.api.aclose())
+        finally:
+            self._stop()
+
+    def __enter__(self) -> "BlockingApi":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class BlockingEndpoint:
+    """Synchronous facade of Endpoint, see BlockingApi
+
+    Args:
+        blocking_api (BlockingApi): BlockingApi class object
+        endpoint (Endpoint): Endpoint class object
+    """
+
+    __slots__ = ("blocking_api", "endpoint")
+
+    def __init__(self, blocking_api: BlockingApi, endpoint: Endpoint) -> None:
+        self.blocking_api = blocking_api
+        self.endpoint = endpoint
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(endpoint='{self.endpoint.endpoint}')"
+
+    def __call__(self, **kwargs: Any) -> Any:
+        return self.blocking_api.run(self.endpoint(**kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self.endpoint, name)
+        if inspect.isasyncgenfunction(value):
+
+            def iterate(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self.blocking_api.iterate(value(*args, **kwargs))
+
+            return iterate
+        if inspect.iscoroutinefunction(value):
+            return self.blocking_api.blocking(value)
+        if name == "only":
+            return lambda *args, **kwargs: BlockingEndpoint(
+                self.blocking_api, value(*args, **kwargs)
+            )
+        return value
+
+    def __dir__(self) -> Any:
+        return sorted({*super().__dir__(), *dir(self.endpoint)})
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+import dataclasses
+import time
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+CacheKey = Tuple[str, str, Hashable]
+
+
+def freeze(value: Any) -> Hashable:
+    """Get hashable representation of http request params"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def endpoint_namespace(endpoint: str) -> str:
+    """Get NetBox API list endpoint for any endpoint
+    ('/dcim/devices/{id}/napalm/' -> '/dcim/devices/')"""
+    return endpoint.split("{", 1)[0]
+
+
+def request_key(endpoint: str, params: Any) -> CacheKey:
+    """Get cache key for GET http request to NetBox API endpoint"""
+    return endpoint_namespace(endpoint), endpoint, freeze(params)
+
+
+@dataclasses.dataclass
+class ResponseCache:
+    """TTL/LRU cache for GET http requests
+
+    The cache is keyed by NetBox API endpoint and http request params.
+    The least recently used entries are evicted, when there are more than 'maxsize'
+    entries. POST/PUT/PATCH/DELETE http requests invalidate all cached entries
+    of their NetBox API list endpoint ('/dcim/devices/' and '/dcim/devices/{id}/'
+    entries for '/dcim/devices/{id}/' PATCH).
+
+    Cached EndpointId objects share the decoded NetBox objects,
+    so don't modify them.
+
+    Args:
+        ttl (float): Time to live of the cache entry, in seconds
+        maxsize (int): Max number of cache entries
+
+    Attributes:
+        hits (int): Number of cache hits
+        misses (int): Number of cache misses, including expired entries
+        evictions (int): Number of LRU evicted entries
+        invalidations (int): Number of entries, invalidated by write http requests
+
+    Usage:
+        In [1]: from anac import api, ResponseCache
+           ...:
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...:     cache=ResponseCache(ttl=300, maxsize=10000),
+           ...: )
+           ...: await a.openapi()
+
+        In [2]: site = await a.dcim_sites(get={"slug": "test"})
+
+        In [3]: site = await a.dcim_sites(get={"slug": "test"})
+
+        In [4]: a.cache.hits, a.cache.misses
+        Out[4]: (1, 1)
+    """
+
+    ttl: float = 60.0
+    maxsize: int = 1024
+    hits: int = dataclasses.field(default=0, init=False)
+    misses: int = dataclasses.field(default=0, init=False)
+    evictions: int = dataclasses.field(default=0, init=False)
+    invalidations: int = dataclasses.field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self.namespaces: Dict[str, Set[CacheKey]] = {}
+        self.generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def generation(self, key: CacheKey) -> int:
+        """Get the number of invalidations of the key list endpoint.
+        Use it with set() to skip the values, requested before invalidation"""
+        return self.generations.get(key[0], 0)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] < time.monotonic():
+            self.discard(key)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation(key):
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        self.namespaces.setdefault(key[0], set()).add(key)
+        while len(self.entries) > self.maxsize:
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+
+    def discard(self, key: CacheKey) -> None:
+        if self.entries.pop(key, None) is not None:
+            keys = self.namespaces[key[0]]
+            keys.discard(key)
+            if not keys:
+                del self.namespaces[key[0]]
+
+    def invalidate(self, endpoint: str) -> None:
+        """Invalidate all entries of 'endpoint' list endpoint"""
+        namespace = endpoint_namespace(endpoint)
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        for key in self.namespaces.pop(namespace, ()):
+            del self.entries[key]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.namespaces.clear()
@@ -0,0 +1,62 @@
+from importlib import import_module
+import json
+from json import JSONDecodeError
+from typing import Any, Callable, Optional, Union
+
+Loads = Callable[[Union[bytes, str]], Any]
+
+DECODERS = ("orjson", "msgspec", "json")
+
+
+def orjson_loads() -> Loads:
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    return import_module("orjson").loads
+
+
+def msgspec_loads() -> Loads:
+    msgspec = import_module("msgspec")
+    decode = msgspec.json.decode
+
+    def loads(content: Union[bytes, str]) -> Any:
+        try:
+            return decode(content)
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), "", 0) from e
+
+    return loads
+
+
+def json_loads() -> Loads:
+    return json.loads
+
+
+def get_loads(name: Optional[str] = None) -> Loads:
+    """Get JSON decoder function
+
+    Args:
+        name (str): 'orjson', 'msgspec' or 'json'. If None, the fastest
+            installed decoder is used
+
+    Returns:
+        loads function. It takes bytes or str and raises json.JSONDecodeError
+        for invalid JSON
+
+    Raises:
+        ImportError: If 'name' decoder is not installed
+        ValueError: For unknown 'name' decoder
+    """
+    loaders = {
+        "orjson": orjson_loads,
+        "msgspec": msgspec_loads,
+        "json": json_loads,
+    }
+    if name is not None:
+        if name not in loaders:
+            raise ValueError(f"Available JSON decoders: {', '.join(DECODERS)}")
+        return loaders[name]()
+    for decoder in DECODERS:
+        try:
+            return loaders[decoder]()
+        except ImportError:
+            continue
+    return json.loads
@@ -1,17 +1,29 @@
+import asyncio
+from collections import deque
 import dataclasses
+from functools import partial
 from itertools import zip_longest
 from json import JSONDecodeError
 import re
+import time
 from typing import (
     Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
     Coroutine,
+    Deque,
     Dict,
+    Iterable,
     Iterator,
     List,
+    Literal,
+    Optional,
+    Tuple,
     TYPE_CHECKING,
-    TypeVar,
     Union,
 )
+from urllib.parse import quote, urlencode, urlsplit
 
 import httpx
 from pydantic import (
@@ -19,66 +31,160 @@ from pydantic import (
     validator,
 )
 
-from .exceptions import raise_for_status, RequestDataError, RequestParamsError
+from .cache import CacheKey, request_key
+from .exceptions import (
+    BulkError,
+    raise_for_status,
+    RequestDataError,
+    RequestParamsError,
+)
+from .jsonstream import ResultsParser
+from .metrics import decode_response, DECODED, RequestEvent
+from .tasks import as_completed_limited, gather_limited
+from .template import compile_template
+from .watermark import Changes, latest, Watermark, watermark_key, WatermarkStore
 
 if TYPE_CHECKING:
     from .api import Api
 
 E = Union["EndpointId", "EndpointIdIterator"]
-T = TypeVar("T")
 
 KwargsType = Dict[str, Union[List[Dict[str, Any]], Dict[str, Any]]]
 KwargsDict = Dict[str, Dict[str, Any]]
+Execution = Literal["serial", "concurrent", "batch"]
+
+METHODS = {
+    action: action.upper() for action in ("get", "put", "post", "patch", "delete")
+}
+# keys of the brief representation, common to the most NetBox objects
+BRIEF_KEYS = frozenset(("id", "url", "display", "name", "slug"))
 
 
 @dataclasses.dataclass
 class EndpointBase:
+    __slots__ = ("api", "url", "endpoint")
+
     api: "Api"
     url: str
     endpoint: str
 
+    if TYPE_CHECKING:
+        # aliases of the slots, used by the internal code (see below)
+        _api: "Api"
+        _url: str
+        _endpoint: str
+
     async def _request(self, kwargs: Dict[str, Any]) -> httpx.Response:
         action = [*kwargs][0]
-        endpoint = self.endpoint
+        data = kwargs[action]
+        api = self._api
 
         if action == "get":
-            params = {
-                "headers": {
-                    "authorization": f"Token {self.api.token}",
-                    "accept": "application/json;",
-                },
-                "params": kwargs[action],
-            }
-            err = RequestParamsError(
-                f"{action.upper()} method must contain object id"
-                ' in the {"id": 1} format',
-            )
+            params = {"headers": api.read_headers, "params": data}
         else:
-            params = {
-                "headers": {
-                    "authorization": f"Token {self.api.token}",
-                    "Content-Type": "application/json;",
-                },
-            }
-            err = RequestDataError(
-                f"{action.upper()} method must contain object id"
-                ' in the {"id": 1} format',
-                action,
+            params = {"headers": api.write_headers}
+            # list of objects for the bulk DELETE
+            if action in ("patch", "put", "post") or isinstance(data, list):
+                params["json"] = data
+
+        try:
+            url = compile_template(self._endpoint).format(api.base_url, data)
+        except (KeyError, TypeError) as e:
+            name = e.args[0] if isinstance(e, KeyError) else "id"
+            message = (
+                f"{action.upper()} method must contain object {name}"
+                f' in the {{"{name}": 1}} format'
             )
-            if action in ("patch", "put", "post"):
-                params = {"json": kwargs[action], **params}
-        if "{id}" in endpoint:
-            try:
-                id_ = f"{kwargs[action]['id']}"
-                endpoint = re.sub(r"{id}", id_, endpoint)
-            except (KeyError, TypeError):
-                raise err
-
-        req = await getattr(self.api.http_session, action)(
-            f"{self.api.base_url}{endpoint}",
-            **params,
-        )
-        return req
+            if action == "get":
+                raise RequestParamsError(message)
+            raise RequestDataError(message, action)
+
+        # AsyncClient.delete() does not send a request body
+        send = partial(api.http_session.request, METHODS[action], url, **params)
+        try:
+            if self._api.hooks:
+                return await self._send_instrumented(action, send)
+            return await self._send(action, send)
+        finally:
+            if action != "get" and self._api.cache is not None:
+                self._api.cache.invalidate(self._endpoint)
+
+    async def _send(
+        self, action: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        if self._api.rate_limiter is not None:
+            send = partial(self._send_limited, action, send)
+        if self._api.retry is None:
+            return await send()
+        return await self._api.retry.send(action, send)
+
+    async def _send_instrumented(
+        self,
+        action: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send http request and pass RequestEvent to Api hooks.
+        The http response is decoded here to measure decode time. The 'stream'
+        http response body is not read, it is decoded by the caller"""
+        attempts = 0
+
+        async def send_counted() -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            return await send()
+
+        response: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        start = time.perf_counter()
+        try:
+            response = await self._send(action, send_counted)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            event = RequestEvent(
+                endpoint=self._endpoint,
+                method=action.upper(),
+                status=None if response is None else response.status_code,
+                latency=time.perf_counter() - start,
+                retries=max(0, attempts - 1),
+                error=error,
+            )
+            if response is not None:
+                event.bytes_out = len(response.request.content)
+                if stream:
+                    length = response.headers.get("content-length", "")
+                    event.bytes_in = int(length) if length.isdigit() else 0
+                else:
+                    event.bytes_in = len(response.content)
+                    start = time.perf_counter()
+                    try:
+                        response.extensions[DECODED] = self._api.loads(response.content)
+                    except JSONDecodeError:
+                        pass
+                    else:
+                        event.decode_time = time.perf_counter() - start
+            for hook in self._api.hooks:
+                hook(event)
+
+    def _decode(self, response: httpx.Response) -> Any:
+        try:
+            return decode_response(response, self._api.loads)
+        except JSONDecodeError:
+            raise httpx.DecodingError("The server returned non json data")
+
+    def _project(self, data: Any) -> Any:
+        """Prune decoded GET http response before EndpointId objects are created.
+        See Endpoint.only"""
+        return data
+
+    async def _send_limited(
+        self, action: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        await self._api.rate_limiter.acquire(action)
+        return await send()
 
     async def request(self, kwargs: Dict[str, Any]) -> E:
         """Send http request
@@ -104,17 +210,78 @@ class EndpointBase:
             RequestParamsError: For invalid http request params
             The difference between data and parameters - https://www.python-httpx.org/quickstart/
         """
+        if "get" in kwargs and (self._api.cache is not None or self._api.coalesce):
+            return await self._shared_request(kwargs)
+
         req = await self._request(kwargs)
 
         if req.status_code == 204 and "post" in kwargs:
             raise httpx.RequestError("Request allocation error")
 
-        raise_for_status(req)
+        raise_for_status(req, loads=self._api.loads)
+
+        return await EndpointIdIterator(
+            api=self._api,
+            url=self._url,
+            endpoint=self._endpoint,
+            response=req,
+            data=self._project(self._decode(req)) if "get" in kwargs else None,
+        )()
 
+    async def _shared_request(self, kwargs: Dict[str, Any]) -> E:
+        """GET http request with Api cache and/or coalescing of identical
+        in-flight GET http requests. Each caller gets its own EndpointId objects"""
+        key = request_key(self._endpoint, kwargs["get"])
+        cached = None if self._api.cache is None else self._api.cache.get(key)
+        if cached is None:
+            if self._api.coalesce:
+                cached = await self._coalesced_fetch(key, kwargs)
+            else:
+                cached = await self._fetch(key, kwargs)
+
+        req, data = cached
         return await EndpointIdIterator(
-            api=self.api, url=self.url, endpoint=self.endpoint, response=req
+            api=self._api,
+            url=self._url,
+            endpoint=self._endpoint,
+            response=req,
+            data=self._project(data),
         )()
 
+    async def _coalesced_fetch(
+        self, key: CacheKey, kwargs: Dict[str, Any]
+    ) -> Tuple[httpx.Response, Any]:
+        in_flight = self._api.in_flight
+        future = in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key, kwargs))
+            in_flight[key] = future
+            future.add_done_callback(
+                lambda f: in_flight.pop(key) if in_flight.get(key) is f else None
+            )
+        # the cancelled caller must not cancel the http request of the others
+        return await asyncio.shield(future)
+
+    async def _fetch(
+        self, key: CacheKey, kwargs: Dict[str, Any]
+    ) -> Tuple[httpx.Response, Any]:
+        cache = self._api.cache
+        generation = None if cache is None else cache.generation(key)
+
+        req = await self._request(kwargs)
+        raise_for_status(req, loads=self._api.loads)
+        data = self._decode(req)
+
+        if cache is not None:
+            cache.set(key, (req, data), generation)
+        return req, data
+
+
+# EndpointId attributes are NetBox object keys and they win over the fields
+# ('url', ...), so the internal code uses the aliases of the field slots
+for _name in EndpointBase.__slots__:
+    setattr(EndpointBase, f"_{_name}", EndpointBase.__dict__[_name])
+
 
 class ValidateEndpoint(BaseModel):
     kwargs: KwargsType
@@ -147,6 +314,59 @@ class EndpointAsIterator(EndpointBase):
         model = next(self.model)
         return self.request(model)
 
+    async def run(self, concurrency: int = 16) -> List[Union[E, Exception]]:
+        """Run pending http requests with at most 'concurrency' of them in flight.
+
+        Unlike asyncio.gather(*EndpointAsIterator), a failed http request does not
+        cancel the other http requests.
+
+        Args:
+            concurrency (int): Max number of concurrent http requests
+
+        Returns:
+            list with EndpointId/EndpointIdIterator objects in the order of
+            EndpointAsIterator http requests. The exception of a failed http request
+            is returned in place of its result
+
+        Usage:
+            In [1]: pending_devices = await a.dcim_devices(
+               ...:     get=[{"name": "test1"}, {"name": "test2"}]
+               ...: )
+
+            In [2]: await pending_devices.run(concurrency=16)
+            Out[2]:
+            [EndpointId(api=Api, url='http://netbox/api', endpoint='/dcim/devices/'),
+             EndpointId(api=Api, url='http://netbox/api', endpoint='/dcim/devices/')]
+        """
+        return await gather_limited(self, concurrency, return_exceptions=True)
+
+    def as_completed(
+        self, concurrency: int = 16
+    ) -> AsyncIterator[Tuple[int, Union[E, Exception]]]:
+        """Run pending http requests with at most 'concurrency' of them in flight
+        and iterate over the results in the completion order.
+
+        Args:
+            concurrency (int): Max number of concurrent http requests
+
+        Returns:
+            async generator with (index, result) tuples, where index is the number
+            of EndpointAsIterator http request and result is EndpointId or
+            EndpointIdIterator object. The exception of a failed http request is
+            yielded in place of its result
+
+        Usage:
+            In [1]: pending_devices = await a.dcim_devices(
+               ...:     get=[{"name": "test1"}, {"name": "test2"}]
+               ...: )
+
+            In [2]: async for index, device in pending_devices.as_completed():
+               ...:     print(index, device.name)
+            1 test2
+            0 test1
+        """
+        return as_completed_limited(self, concurrency)
+
     @staticmethod
     def dict_generator(
         kwargs: KwargsType,
@@ -190,6 +410,93 @@ class Endpoint(EndpointBase):
         Out[3]: anac.core.endpoint.Endpoint
     """
 
+    fields: Optional[Tuple[str, ...]] = dataclasses.field(default=None, repr=False)
+    brief: bool = dataclasses.field(default=False, repr=False)
+
+    def only(self, *fields: str, brief: bool = False) -> "Endpoint":
+        """Get Endpoint object with column projection for GET http requests.
+
+        NetBox objects of the projected Endpoint contain only 'fields' and 'id'.
+        NetBox 4.0+ returns only 'fields' with 'fields' http request param.
+        For the older NetBox versions, '/dcim/devices/' and
+        '/virtualization/virtual-machines/' are requested with
+        'exclude=config_context' and the other fields are pruned before
+        EndpointId objects are created. With 'brief', NetBox returns the brief
+        representation of NetBox objects ('brief=1' http request param), the same
+        as the nested NetBox objects.
+
+        Args:
+            fields: NetBox object keys to keep. All keys are kept, if no fields
+            brief (bool): Request the brief representation of NetBox objects
+
+        Returns:
+            Endpoint class object
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: devices = a.dcim_devices.only("name", "status")
+
+            In [3]: all_devices = await devices.get_all()
+
+            In [4]: dir(all_devices[0])[-3:]
+            Out[4]: ['id', 'name', 'status']
+
+            In [5]: sites = await a.dcim_sites.only(brief=True)(get={})
+        """
+        return dataclasses.replace(
+            self,
+            fields=("id", *(f for f in fields if f != "id")) if fields else None,
+            brief=brief,
+        )
+
+    def _projection(self) -> Dict[str, Any]:
+        """Get http request params of the column projection"""
+        if self.brief:
+            return {"brief": 1}
+        if self.fields is None:
+            return {}
+        if supports_fields(self.api):
+            return {"fields": ",".join(self.fields)}
+        if "config_context" not in self.fields and self.endpoint in (
+            "/dcim/devices/",
+            "/virtualization/virtual-machines/",
+        ):
+            return {"exclude": "config_context"}
+        return {}
+
+    def _keeping(self, key: str) -> "Endpoint":
+        """Get Endpoint object with 'key' kept by the column projection"""
+        endpoint = self
+        if endpoint.brief and key not in BRIEF_KEYS:
+            endpoint = dataclasses.replace(endpoint, brief=False)
+        if endpoint.fields is not None and key not in endpoint.fields:
+            endpoint = dataclasses.replace(endpoint, fields=(*endpoint.fields, key))
+        return endpoint
+
+    def _projected(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if "get" in kwargs and (self.brief or self.fields is not None):
+            return {"get": {**self._projection(), **kwargs["get"]}}
+        return kwargs
+
+    async def _request(self, kwargs: Dict[str, Any]) -> httpx.Response:
+        return await super()._request(self._projected(kwargs))
+
+    async def request(self, kwargs: Dict[str, Any]) -> E:
+        # the projection params are a part of the cache key
+        return await super().request(self._projected(kwargs))
+
+    def _project(self, data: Any) -> Any:
+        if self.fields is None or "fields" in self._projection():
+            return data
+        return prune(data, self.fields)
+
     async def __call__(
         self, **kwargs: Union[List[Dict[str, Any]], Dict[str, Any]]
     ) -> Union[E, "EndpointAsIterator"]:
@@ -352,24 +659,793 @@ class Endpoint(EndpointBase):
             )
         return req
 
+    async def _get_page(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        req = await self._request({"get": params})
+        raise_for_status(req, loads=self.api.loads)
+        return self._decode(req)["results"]
+
+    async def get_all(
+        self,
+        get: Optional[Dict[str, Any]] = None,
+        limit: int = 1000,
+        concurrency: int = 8,
+        prefetch: Optional[Iterable[str]] = None,
+        raw: bool = False,
+    ) -> Union[E, List[Dict[str, Any]], Any]:
+        """Get all NetBox objects from the paginated list endpoint.
+
+        The first page is requested with 'limit' and 'offset' params. Then the
+        'count' key of the first page is used to calculate the offset/limit windows
+        for the remaining pages, which are requested concurrently over the shared
+        Api.http_session. The number of concurrent http requests is limited by
+        'concurrency'. All pages are merged into one EndpointIdIterator object
+        in the NetBox order.
+
+        Args:
+            get (dict): http request params (filters), like Endpoint(get={...})
+            limit (int): Page size. NetBox limits it with the MAX_PAGE_SIZE
+                setting, so the real page size is taken from the first page
+            concurrency (int): Max number of concurrent http requests
+            prefetch: Names of the nested NetBox object references ('site',
+                'device_type', 'tags', ...) to replace with the full EndpointId
+                objects. The referenced objects are requested with Endpoint.lookup,
+                a few http requests per NetBox API endpoint instead of one http
+                request per object
+            raw (bool): Return the decoded JSON NetBox objects (dicts) without
+                EndpointId objects. The prefetched objects are dicts too
+
+        Returns:
+            - EndpointIdIterator class object: Iterator with all EndpointId objects
+            - EndpointId class object: If NetBox returns a single result
+            - list: NetBox objects (dicts), if 'raw'. The decoded JSON, if NetBox
+              API endpoint is not paginated
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            RequestParamsError: For invalid http request params
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: all_interfaces = await a.dcim_interfaces.get_all(
+               ...:     get={"site": "test"}, concurrency=16
+               ...: )
+
+            In [3]: len(all_interfaces)
+            Out[3]: 80000
+
+            In [4]: all_devices = await a.dcim_devices.get_all(
+               ...:     prefetch=["device_type", "site"]
+               ...: )
+
+            In [5]: all_devices[0].device_type.airflow
+            Out[5]: 'front-to-rear'
+
+            In [6]: rows = await a.dcim_devices.get_all(raw=True)
+
+            In [7]: rows[0]["name"]
+            Out[7]: 'test'
+        """
+        req, data = await self._get_rows(get, limit, concurrency)
+        data = self._project(data)
+        if prefetch and isinstance(data, list):
+            await self._prefetch(data, prefetch, concurrency, raw)
+        if raw:
+            return data
+
+        return await EndpointIdIterator(
+            api=self.api,
+            url=self.url,
+            endpoint=self.endpoint,
+            response=req,
+            data=data,
+        )()
+
+    async def _get_rows(
+        self, get: Optional[Dict[str, Any]], limit: int, concurrency: int
+    ) -> Tuple[httpx.Response, Any]:
+        """Get the first page response and the results of all pages.
+        If NetBox API endpoint is not paginated, its decoded JSON is returned"""
+        params = {**(get or {}), "limit": limit}
+        offset = int(params.setdefault("offset", 0))
+
+        req = await self._request({"get": params})
+        raise_for_status(req, loads=self.api.loads)
+        payload = self._decode(req)
+        if not isinstance(payload, dict) or "results" not in payload:
+            return req, payload
+
+        rows = payload["results"]
+        page_size = len(rows)
+        if page_size and payload.get("next"):
+            pages = await gather_limited(
+                (
+                    self._get_page({**params, "limit": page_size, "offset": o})
+                    for o in range(offset + page_size, payload["count"], page_size)
+                ),
+                concurrency,
+            )
+            for page in pages:
+                rows.extend(page)
+        return req, rows
+
+    async def _prefetch(
+        self,
+        rows: List[Dict[str, Any]],
+        fields: Iterable[str],
+        concurrency: int,
+        raw: bool = False,
+    ) -> None:
+        """Replace the nested NetBox object references in 'rows' with the full
+        EndpointId objects or their dicts, if 'raw'. References without
+        NetBox objects are kept"""
+        fields = [*fields]
+        ids: Dict[str, Dict[Any, None]] = {}
+        for ref in iter_references(rows, fields):
+            ids.setdefault(reference_endpoint(ref["url"]), {})[ref["id"]] = None
+
+        endpoints = [*ids]
+        objects = dict(
+            zip(
+                endpoints,
+                await gather_limited(
+                    (
+                        Endpoint(self.api, self.url, endpoint).lookup(
+                            ids[endpoint], concurrency=concurrency
+                        )
+                        for endpoint in endpoints
+                    ),
+                    concurrency,
+                ),
+            )
+        )
+
+        def resolve(ref: Any) -> Any:
+            if is_reference(ref):
+                obj = objects[reference_endpoint(ref["url"])].get(ref["id"])
+                if obj is None:
+                    return ref
+                return obj.kwargs if raw else obj
+            return ref
+
+        for row in rows:
+            for field in fields:
+                value = row.get(field)
+                if isinstance(value, list):
+                    row[field] = [resolve(ref) for ref in value]
+                elif value is not None:
+                    row[field] = resolve(value)
+
+    async def lookup(
+        self,
+        values: Iterable[Any],
+        key: str = "id",
+        get: Optional[Dict[str, Any]] = None,
+        max_url_length: int = 4000,
+        concurrency: int = 8,
+    ) -> Dict[Any, "EndpointId"]:
+        """Get many NetBox objects by id (name, slug, ...) with a few http requests.
+
+        The values are grouped into NetBox API list endpoint filters with repeated
+        query parameters ('?id=1&id=2&id=3...'), so the http request URL is not
+        longer than 'max_url_length'. The http requests run concurrently.
+
+        Args:
+            values: ids, names, slugs or other 'key' values
+            key (str): NetBox object key and NetBox API filter name
+            get (dict): Additional http request params (filters)
+            max_url_length (int): Max http request URL length
+            concurrency (int): Max number of concurrent http requests
+
+        Returns:
+            dict with EndpointId objects by 'values'. The values without NetBox
+            objects are missing. If there are several NetBox objects for the value,
+            the last of them is used
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            ValueError: If some value does not fit into 'max_url_length'
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: devices = await a.dcim_devices.lookup([1, 2, 3])
+
+            In [3]: devices[2].name
+            Out[3]: 'test2'
+
+            In [4]: sites = await a.dcim_sites.lookup(["site1", "site2"], key="slug")
+
+            In [5]: sites["site1"].id
+            Out[5]: 1
+        """
+        values = [*dict.fromkeys(values)]
+        # NetBox objects are keyed by 'key', so the projection must keep it
+        source = self._keeping(key)
+        # the projection params are added by Endpoint._request
+        params = source._projected({"get": get or {}})["get"]
+        prefix = len(f"{self.api.base_url}{self.endpoint}?{urlencode(params)}")
+        # '&limit=1000&offset=0'
+        length = max_url_length - prefix - 32
+
+        chunks: List[List[Any]] = [[]]
+        chunk_length = 0
+        for value in values:
+            value_length = len(f"&{key}={quote(str(value), safe='')}")
+            if value_length > length:
+                raise ValueError(f"'{value}' {key} is too long for max_url_length")
+            if chunk_length + value_length > length:
+                chunks.append([])
+                chunk_length = 0
+            chunks[-1].append(value)
+            chunk_length += value_length
+
+        pages = await gather_limited(
+            (
+                source._get_rows({**(get or {}), key: chunk}, len(chunk), 1)
+                for chunk in chunks
+                if chunk
+            ),
+            concurrency,
+        )
+
+        objects = {
+            str(data.get(key)): EndpointId(
+                api=self.api,
+                url=self.url,
+                endpoint=self.endpoint,
+                kwargs=source._project(data),
+            )
+            for _, rows in pages
+            for data in rows
+        }
+        return {value: objects[str(value)] for value in values if str(value) in objects}
+
+    async def _bulk_request(
+        self, action: str, objects: List[Dict[str, Any]]
+    ) -> httpx.Response:
+        req = await self._request({action: objects})
+        raise_for_status(req, loads=self.api.loads)
+        return req
+
+    async def bulk(
+        self,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        **kwargs: List[Dict[str, Any]],
+    ) -> E:
+        """Create, update or delete many NetBox objects with the bulk http requests
+        to NetBox API list endpoint ('/dcim/devices/', '/ipam/prefixes/', ...).
+
+        The objects are sent as lists of 'chunk_size' objects, so one http request
+        creates/updates/deletes 'chunk_size' NetBox objects. The number of concurrent
+        http requests is limited by 'concurrency'. A failed chunk does not stop
+        the other chunks, the failed and the sent chunks are in BulkError.
+
+        Args:
+            chunk_size (int): Number of objects in a single http request
+            concurrency (int): Max number of concurrent http requests
+            kwargs: a single http request action ('post', 'put', 'patch' or 'delete')
+                with list of objects. 'put', 'patch' and 'delete' objects must contain
+                object id
+
+        Returns:
+            - EndpointIdIterator class object: Iterator with the created/updated
+                EndpointId objects in the order of the objects. It is empty for
+                'delete' action
+            - EndpointId class object: If there is a single object
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            RequestDataError: For invalid http request data
+            BulkError: If some chunks are failed
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: interfaces = await a.dcim_interfaces.bulk(
+               ...:     patch=[{"id": 1, "enabled": False}, {"id": 2, "enabled": False}],
+               ...:     chunk_size=500,
+               ...: )
+
+            In [3]: interfaces[1].enabled
+            Out[3]: False
+        """
+        if len(kwargs) != 1 or [*kwargs][0] not in ("post", "put", "patch", "delete"):
+            raise ValueError("Available arguments: 'post', 'put', 'patch', 'delete'")
+        action, objects = [*kwargs.items()][0]
+
+        if compile_template(self.endpoint).params:
+            raise RequestDataError(
+                f"bulk {action.upper()} is available for the list endpoints only",
+                action,
+            )
+        if not objects:
+            raise RequestDataError(
+                f"bulk {action.upper()} method must contain list of objects", action
+            )
+        if action != "post" and not all(
+            isinstance(obj, dict) and "id" in obj for obj in objects
+        ):
+            raise RequestDataError(
+                f"{action.upper()} method must contain object id"
+                ' in the {"id": 1} format',
+                action,
+            )
+
+        chunks = [
+            objects[i : i + chunk_size] for i in range(0, len(objects), chunk_size)
+        ]
+        responses = await gather_limited(
+            (self._bulk_request(action, chunk) for chunk in chunks),
+            concurrency,
+            return_exceptions=True,
+        )
+
+        data: List[Dict[str, Any]] = []
+        errors = []
+        succeeded: List[Dict[str, Any]] = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                errors.append((chunk, response))
+                continue
+            succeeded.extend(chunk)
+            if action != "delete":
+                data.extend(self._decode(response))
+        if errors:
+            raise BulkError(action, errors, succeeded, data) from errors[0][1]
+
+        return await EndpointIdIterator(
+            api=self.api,
+            url=self.url,
+            endpoint=self.endpoint,
+            response=responses[-1],
+            data=data,
+        )()
+
+    async def changes(
+        self,
+        store: WatermarkStore,
+        get: Optional[Dict[str, Any]] = None,
+        reconcile: bool = False,
+        limit: int = 1000,
+        concurrency: int = 8,
+    ) -> Changes:
+        """Get NetBox objects, created or updated since the previous sync.
+
+        The latest 'last_updated' value of the synced NetBox objects is saved
+        into 'store' as a watermark for NetBox API list endpoint and 'get' filters.
+        The next sync requests only NetBox objects with 'last_updated__gte'
+        watermark, so the objects, updated at the watermark time, are returned
+        again. The first sync returns all NetBox objects.
+
+        NetBox does not return the deleted objects. With 'reconcile', ids of all
+        NetBox objects are requested with 'brief' http requests and compared
+        with ids of the previous sync.
+
+        Args:
+            store (WatermarkStore): Watermark store (MemoryWatermarkStore,
+                JSONWatermarkStore, SQLiteWatermarkStore)
+            get (dict): http request params (filters), like Endpoint(get={...})
+            reconcile (bool): Find the deleted NetBox objects
+            limit (int): Page size
+            concurrency (int): Max number of concurrent http requests
+
+        Returns:
+            Changes class object with the created/updated EndpointId objects,
+            ids of the deleted NetBox objects and the new watermark
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            RequestParamsError: For invalid http request params
+
+        Usage:
+            In [1]: from anac import api, JSONWatermarkStore
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+               ...: store = JSONWatermarkStore("~/.cache/anac/watermarks.json")
+
+            In [2]: changes = await a.dcim_devices.changes(store, reconcile=True)
+
+            In [3]: len(changes.objects), changes.deleted
+            Out[3]: (4010, [])
+
+            In [4]: changes = await a.dcim_devices.changes(store, reconcile=True)
+
+            In [5]: len(changes.objects), changes.deleted
+            Out[5]: (1, [4075])
+        """
+        get = get or {}
+        key = watermark_key(self.endpoint, get)
+        previous = store.load(key) or Watermark()
+
+        params = dict(get)
+        if previous.last_updated is not None:
+            params["last_updated__gte"] = previous.last_updated
+        source = self._keeping("last_updated")
+        _, rows = await source._get_rows(params, limit, concurrency)
+
+        watermark = Watermark(
+            last_updated=latest(
+                [previous.last_updated, *(row.get("last_updated") for row in rows)]
+            )
+        )
+        deleted: List[int] = []
+        if reconcile:
+            _, brief_rows = await self._get_rows(
+                {**get, "brief": 1}, limit, concurrency
+            )
+            watermark.ids = sorted(row["id"] for row in brief_rows)
+            if previous.ids is not None:
+                deleted = sorted({*previous.ids} - {*watermark.ids})
+        elif previous.ids is not None:
+            # the ids are kept for the next reconcile, with the created objects
+            watermark.ids = sorted({*previous.ids, *(row["id"] for row in rows)})
+
+        store.save(key, watermark)
+        return Changes(
+            objects=[
+                EndpointId(
+                    api=self.api, url=self.url, endpoint=self.endpoint, kwargs=data
+                )
+                for data in self._project(rows)
+            ],
+            deleted=deleted,
+            watermark=watermark,
+        )
+
+    async def stream(
+        self,
+        get: Optional[Dict[str, Any]] = None,
+        limit: int = 1000,
+        prefetch: int = 1,
+        raw: bool = False,
+    ) -> AsyncIterator[Union["EndpointId", Dict[str, Any]]]:
+        """Iterate over all NetBox objects from the paginated list endpoint
+        page by page.
+
+        Unlike Endpoint.get_all, only the current page and 'prefetch' next pages
+        are kept in memory. The next pages are requested in the background,
+        while the current page is being iterated. If NetBox API endpoint is not
+        paginated, its object (or list of objects) is the only page.
+
+        Args:
+            get (dict): http request params (filters), like Endpoint(get={...})
+            limit (int): Page size. NetBox limits it with the MAX_PAGE_SIZE
+                setting, so the real page size is taken from the first page
+            prefetch (int): Number of pages, requested in the background
+            raw (bool): Yield the decoded JSON NetBox objects (dicts) without
+                EndpointId objects
+
+        Returns:
+            Async generator with EndpointId objects or dicts, if 'raw'
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            RequestParamsError: For invalid http request params
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: async for ip in a.ipam_ip_addresses.stream(get={"vrf_id": 1}):
+               ...:     print(ip.address)
+            10.0.0.1/24
+            10.0.0.2/24
+            ...
+        """
+        params = {**(get or {}), "limit": limit}
+        offset = int(params.setdefault("offset", 0))
+
+        req = await self._request({"get": params})
+        raise_for_status(req, loads=self.api.loads)
+        payload = self._decode(req)
+        page = page_results(payload)
+        page_size = len(page)
+
+        offsets: Iterator[int] = iter(())
+        if page_size and isinstance(payload, dict) and payload.get("next"):
+            offsets = iter(range(offset + page_size, payload["count"], page_size))
+        del req, payload
+
+        pending: Deque["asyncio.Future[List[Dict[str, Any]]]"] = deque()
+
+        def get_page(next_offset: int) -> Coroutine[Any, Any, List[Dict[str, Any]]]:
+            return self._get_page({**params, "limit": page_size, "offset": next_offset})
+
+        try:
+            while True:
+                while len(pending) < prefetch:
+                    next_offset = next(offsets, None)
+                    if next_offset is None:
+                        break
+                    pending.append(asyncio.ensure_future(get_page(next_offset)))
+
+                for obj in self._objects(self._project(page), raw):
+                    yield obj
+
+                if pending:
+                    page = await pending.popleft()
+                else:
+                    next_offset = next(offsets, None)
+                    if next_offset is None:
+                        break
+                    page = await get_page(next_offset)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _objects(
+        self, rows: List[Dict[str, Any]], raw: bool
+    ) -> Iterator[Union["EndpointId", Dict[str, Any]]]:
+        if raw:
+            return iter(rows)
+        return (
+            EndpointId(api=self.api, url=self.url, endpoint=self.endpoint, kwargs=data)
+            for data in rows
+        )
+
+    async def stream_raw(
+        self, get: Optional[Dict[str, Any]] = None, limit: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all NetBox objects (dicts) from the paginated list
+        endpoint, decoding http response bodies incrementally.
+
+        Each page is streamed with httpx.Response.aiter_bytes and the objects of
+        its 'results' are decoded with ResultsParser, as soon as they are received.
+        Neither the whole page body nor EndpointId objects are kept in memory,
+        so it has the lowest memory footprint for export jobs. The pages are
+        requested one by one. Api hooks get an event for each page without
+        the decode time, 'bytes_in' is taken from 'Content-Length' http header.
+        For the highest throughput, use Endpoint.stream with 'raw'.
+
+        Args:
+            get (dict): http request params (filters), like Endpoint(get={...})
+            limit (int): Page size. NetBox limits it with the MAX_PAGE_SIZE
+                setting, so the real page size is taken from the first page
+
+        Returns:
+            Async generator with dicts
+
+        Raises:
+            httpx._exceptions:
+                See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+            json.JSONDecodeError: If NetBox API endpoint is not paginated
+
+        Usage:
+            In [1]: from anac import api
+               ...:
+               ...: a = api(
+               ...:     "http://netbox/",
+               ...:     token="api_token",
+               ...: )
+               ...: await a.openapi()
+
+            In [2]: async for ip in a.ipam_ip_addresses.stream_raw(get={"vrf_id": 1}):
+               ...:     print(ip["address"])
+            10.0.0.1/24
+            10.0.0.2/24
+            ...
+        """
+        params = {**(get or {}), "limit": limit}
+        offset = int(params.setdefault("offset", 0))
+        api = self.api
+        url = compile_template(self.endpoint).format(api.base_url, params)
+
+        while True:
+            request = api.http_session.build_request(
+                "GET",
+                url,
+                params=self._projected({"get": params})["get"],
+                headers=api.read_headers,
+            )
+            send = partial(self._send_stream, request)
+            if api.hooks:
+                response = await self._send_instrumented("get", send, stream=True)
+            else:
+                response = await self._send("get", send)
+            try:
+                raise_for_status(response, loads=api.loads)
+                parser = ResultsParser(api.loads)
+                page_size = 0
+                async for chunk in response.aiter_bytes():
+                    for data in parser.feed(chunk):
+                        page_size += 1
+                        yield self._project(data)
+                meta = parser.close()
+            finally:
+                await response.aclose()
+
+            if not page_size or not meta.get("next"):
+                return
+            offset += page_size
+            params = {**params, "limit": page_size, "offset": offset}
+
+    async def _send_stream(self, request: httpx.Request) -> httpx.Response:
+        response = await self.api.http_session.send(request, stream=True)
+        # error responses are read, so the retried ones are closed
+        if not response.is_success:
+            await response.aread()
+        return response
+
 
 class ValidateEndpointId(BaseModel):
-    kwargs: KwargsDict
+    kwargs: KwargsType
 
     @validator("kwargs", pre=True, always=True)
-    def set_default_kwargs(cls, v: KwargsDict) -> KwargsDict:
+    def set_default_kwargs(cls, v: KwargsType) -> KwargsType:
         return v or {"get": {}}
 
     @validator("kwargs")
-    def check_requests(cls, v: KwargsDict) -> KwargsDict:
+    def check_requests(cls, v: KwargsType) -> KwargsType:
         for key in v:
             if key not in ("get", "put", "patch", "delete"):
                 raise ValueError("Available arguments: 'get', 'put', 'patch', 'delete'")
         return v
 
 
+def is_reference(value: Any) -> bool:
+    """Check if 'value' is a nested NetBox object reference
+    ({'id': 1, 'url': 'http://netbox/api/dcim/sites/1/', ...})"""
+    return isinstance(value, dict) and "id" in value and "url" in value
+
+
+def iter_references(
+    rows: Iterable[Dict[str, Any]], fields: List[str]
+) -> Iterator[Dict[str, Any]]:
+    """Iterate over the nested NetBox object references of 'fields' in 'rows'"""
+    for row in rows:
+        for field in fields:
+            value = row.get(field)
+            for ref in value if isinstance(value, list) else (value,):
+                if is_reference(ref):
+                    yield ref
+
+
+def reference_endpoint(url: str) -> str:
+    """Get NetBox API list endpoint of the nested NetBox object reference
+    ('http://netbox/api/dcim/device-types/1/' -> '/dcim/device-types/')"""
+    path = urlsplit(url).path.rstrip("/")
+    path = path[path.find("/api/") + 4 :]
+    return f"{path.rsplit('/', 1)[0]}/"
+
+
+def page_results(payload: Any) -> List[Dict[str, Any]]:
+    """Get NetBox objects of the decoded JSON page. If NetBox API endpoint is not
+    paginated, its object (or list of objects) is the only page"""
+    if isinstance(payload, dict) and "results" in payload:
+        results: List[Dict[str, Any]] = payload["results"]
+        return results
+    return payload if isinstance(payload, list) else [payload]
+
+
+def supports_fields(api: "Api") -> bool:
+    """Check if NetBox supports 'fields' http request param (NetBox 4.0+).
+    NetBox version is taken from the openapi spec ('4.0.3 (4.0)')"""
+    match = re.match(r"(\d+)\.", api.spec_version or "")
+    return match is not None and int(match.group(1)) >= 4
+
+
+def prune(data: Any, fields: Iterable[str]) -> Any:
+    """Keep only 'fields' keys of NetBox objects in decoded JSON
+    (list of objects, page with 'results' or a single object)"""
+    if isinstance(data, list):
+        return [prune(obj, fields) for obj in data]
+    if isinstance(data, dict):
+        if isinstance(data.get("results"), list):
+            return {**data, "results": prune(data["results"], fields)}
+        return {key: data[key] for key in fields if key in data}
+    return data
+
+
+def merge_patches(models: Iterable[KwargsType]) -> Iterator[KwargsType]:
+    """Merge all 'patch' http requests into the first of them
+    ({'patch': {'a': 1}}, {'get': {}}, {'patch': {'b': 2}} ->
+    {'patch': {'a': 1, 'b': 2}}, {'get': {}})"""
+    models = [*models]
+    patch: Dict[str, Any] = {}
+    for model in models:
+        value = model.get("patch")
+        if isinstance(value, dict):
+            patch.update(value)
+    merged = False
+    for model in models:
+        if "patch" not in model:
+            yield model
+        elif not merged:
+            merged = True
+            yield {"patch": patch}
+
+
+# dict attributes, shadowed by the same DictAttribute keys
+DICT_METHODS = frozenset(name for name in dir(dict) if not name.startswith("__"))
+
+
+def normalize_key(key: str) -> str:
+    return key.lower().replace(" ", "_")
+
+
+def get_attribute(data: Dict[str, Any], name: str, key: Optional[str] = None) -> Any:
+    """Get 'data' value by attribute name.
+
+    Attribute name is a lower case key with underscores instead of spaces.
+    Nested dict values and the dicts of nested list values are replaced with
+    DictAttribute objects on first access, so each nested dict is kept
+    in memory once.
+
+    Raises:
+        KeyError: If 'data' has no such key
+    """
+    if key is None:
+        if name in data:
+            key = name
+        else:
+            key = next(k for k in data if normalize_key(k) == name)
+    value = data[key]
+    if type(value) is dict:
+        value = data[key] = DictAttribute(value)
+    elif type(value) is list and any(type(v) is dict for v in value):
+        value = data[key] = [DictAttribute(v) if type(v) is dict else v for v in value]
+    return value
+
+
 class DictAttribute(dict):
-    pass
+    """dict with access to the values as attributes
+    ({'id': 1}['id'] == DictAttribute({'id': 1}).id).
+    The keys win over the dict methods ({'items': 5} -> .items == 5)"""
+
+    __slots__ = ()
+
+    def __getattribute__(self, name: str) -> Any:
+        if name in DICT_METHODS:
+            try:
+                return get_attribute(self, name)
+            except (KeyError, StopIteration):
+                pass
+        return super().__getattribute__(name)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return get_attribute(self, name)
+        except (KeyError, StopIteration):
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            ) from None
+
+    def __dir__(self) -> List[str]:
+        return sorted({*super().__dir__(), *map(normalize_key, self)})
 
 
 @dataclasses.dataclass
@@ -449,12 +1525,33 @@ class EndpointIdAsIterator:
         return len(self.responses)
 
 
-@dataclasses.dataclass
+def netbox_key(name: str) -> Any:
+    """Get EndpointId property for EndpointBase field 'name'. It returns
+    NetBox object 'name' key value ('url', ...), if the object has it"""
+    slot = EndpointBase.__dict__[name]
+
+    def get(self: "EndpointId") -> Any:
+        kwargs = self.kwargs
+        if name in kwargs:
+            return kwargs[name]
+        return slot.__get__(self)
+
+    def set(self: "EndpointId", value: Any) -> None:
+        if name in self.kwargs:
+            self.kwargs[name] = value
+        else:
+            slot.__set__(self, value)
+
+    return property(get, set)
+
+
+@dataclasses.dataclass(init=False, repr=False)
 class EndpointId(EndpointBase):
     """NetBox API endpoint id object
     ('/dcim/devices/{id}', '/ipam/roles/{id}', ...).
 
-    EndpointId object has all attributes of NetBox object.
+    EndpointId object has all attributes of NetBox object. The assigned
+    attributes are written to NetBox object dict ('kwargs', vars()).
     EndpointId object has .response attribute, containing httpx.Response object.
 
     Args:
@@ -480,35 +1577,67 @@ class EndpointId(EndpointBase):
         Out[4]: 4010
     """
 
-    kwargs: Dict[str, Any] = dataclasses.field(repr=False)
+    __slots__ = ("kwargs", "_keys")
 
-    def __post_init__(self) -> None:
-        self.generate_attrs(self, self.kwargs)
-
-    def generate_attrs(self, obj: T, dict_: Dict[str, Any]) -> None:
-        for key, value in dict_.items():
-            if isinstance(value, dict):
-                dict_obj = DictAttribute(value)
-                setattr(obj, key.lower().replace(" ", "_"), dict_obj)
-                self.generate_attrs(dict_obj, value)
-            else:
-                setattr(
-                    obj,
-                    key.lower().replace(" ", "_"),
-                    value,
-                )
+    kwargs: Dict[str, Any]
+
+    if TYPE_CHECKING:
+        _keys: Optional[Dict[str, str]]
+
+    api = netbox_key("api")
+    url = netbox_key("url")
+    endpoint = netbox_key("endpoint")
+
+    def __init__(
+        self, api: "Api", url: str, endpoint: str, kwargs: Dict[str, Any]
+    ) -> None:
+        # the slots are set directly, the other attributes are NetBox object keys
+        object.__setattr__(self, "kwargs", kwargs)
+        object.__setattr__(self, "_keys", None)
+        object.__setattr__(self, "_api", api)
+        object.__setattr__(self, "_url", url)
+        object.__setattr__(self, "_endpoint", endpoint)
 
     def __str__(self):
         return self.__class__.__name__
 
+    def _key(self, name: str) -> Optional[str]:
+        """Get NetBox object key by attribute name"""
+        if name in self.kwargs:
+            return name
+        # NetBox object keys are mostly attribute names already, so the
+        # normalized keys are calculated on the first miss only
+        if self._keys is None:
+            self._keys = {normalize_key(k): k for k in self.kwargs}
+        return self._keys.get(name)
+
     def __getattr__(self, name: str) -> Any:
-        if name in self.__dict__:
-            return self.__dict__[name]
+        if name not in EndpointId.__slots__:
+            key = self._key(name)
+            if key is not None:
+                return get_attribute(self.kwargs, name, key)
+        raise AttributeError(f"'{str(self)}' object has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the attributes, which are not EndpointId class attributes,
+        # are NetBox object keys, the same as in __getattr__
+        if hasattr(EndpointId, name):
+            object.__setattr__(self, name, value)
         else:
-            raise AttributeError(f"'{str(self)}' object has no attribute '{name}'")
+            self.kwargs[self._key(name) or name] = value
+
+    @property
+    def __dict__(self) -> Dict[str, Any]:  # type: ignore[override]
+        """NetBox object keys for vars()"""
+        return self.kwargs
+
+    def __dir__(self) -> List[str]:
+        return sorted({*super().__dir__(), *map(normalize_key, self.kwargs)})
 
     async def __call__(
-        self, **kwargs: Dict[str, Any]
+        self,
+        execution: Execution = "serial",
+        **kwargs: Union[List[Dict[str, Any]], Dict[str, Any]],
     ) -> Union[E, "EndpointIdAsIterator"]:
         """EndpointId object is a coroutine
         for interacting with NetBox API endpoint id.
@@ -516,7 +1645,13 @@ class EndpointId(EndpointBase):
         You can run each EndpointId object:
         - to send http request and get results/new EndpointId objects
         - to send http requests and get Iterator with results/new EndpointId objects.
-            All http requests in this coroutine will be run serially using 'await'.
+            The http requests are run according to 'execution' policy:
+            - 'serial': one by one in the order of the arguments (default)
+            - 'concurrent': all at once. Use it for the independent http requests,
+                like GETs with different params
+            - 'batch': all 'patch' data are merged into a single PATCH http request
+                in place of the first 'patch' (the later values win), the other
+                http requests are run serially
 
                                                  EndpointIdAsIterator
                                                  /
@@ -527,7 +1662,9 @@ class EndpointId(EndpointBase):
                     EndpointAsIterator
 
         Args:
-            kwargs: dict with http request actions + params/data
+            execution (str): 'serial', 'concurrent' or 'batch'
+            kwargs: dict with http request actions + params/data. The action value
+                is a dict or a list of dicts for many http requests
 
         Returns:
             - new EndpointId class object: Describes NetBox object (site, device,
@@ -574,28 +1711,51 @@ class EndpointId(EndpointBase):
 
             In [9]: test_device[1].name
             Out[9]: 'testtest'
+
+            In [10]: interfaces = await test_device(
+                ...:     get=[{"brief": 1}, {"exclude": "config_context"}],
+                ...:     execution="concurrent",
+                ...: )
+
+            In [11]: test_device = await test_device(
+                ...:     patch=[{"name": "test"}, {"serial": "123"}],
+                ...:     execution="batch",
+                ...: )
+
+            In [12]: len(test_device)
+            Out[12]: 1
         """
-        self.endpoint = (
-            f"{self.endpoint}"
-            if "{id}" in self.endpoint
-            else f"{self.endpoint}{'{id}/'}"
-        )
+        if execution not in ("serial", "concurrent", "batch"):
+            raise ValueError("Available executions: 'serial', 'concurrent', 'batch'")
+
+        if "{id}" not in self._endpoint:
+            self._endpoint = f"{self._endpoint}{{id}}/"  # type: ignore[misc]
 
         kwargs = ValidateEndpointId(kwargs=kwargs).kwargs
 
         new_kwargs: KwargsType = {
-            key: {"id": self.id, **value} for key, value in kwargs.items()
+            key: (
+                [{"id": self.id, **v} for v in value]
+                if isinstance(value, list)
+                else {"id": self.id, **value}
+            )
+            for key, value in kwargs.items()
         }
 
-        if len(new_kwargs) == 1:
+        if len(new_kwargs) == 1 and isinstance([*new_kwargs.values()][0], dict):
             return await self.request(new_kwargs)
         else:
-            responses = []
             models = EndpointAsIterator.dict_generator(new_kwargs)
-            for model in models:
-                responses.append(await self.request(model))
+            if execution == "batch":
+                models = merge_patches(models)
+            if execution == "concurrent":
+                responses = await asyncio.gather(*map(self.request, models))
+            else:
+                responses = []
+                for model in models:
+                    responses.append(await self.request(model))
             return EndpointIdAsIterator(
-                responses=responses,
+                responses=[*responses],
             )
 
 
@@ -612,6 +1772,8 @@ class EndpointIdIterator:
         url (str): NetBox url
         endpoint (str): NetBox API endpoint str ('/dcim/devices/', ...)
         response (httpx.Response): httpx.Response object
+        data: Decoded httpx.Response JSON. If None, the response is decoded
+            with Api JSON decoder. EndpointIdIterator.data is the decoded JSON
 
     What is EndpointIdIterator:
         In [1]: from anac import api
@@ -636,6 +1798,7 @@ class EndpointIdIterator:
     url: str
     endpoint: str
     response: httpx.Response = dataclasses.field(repr=False)
+    data: Any = dataclasses.field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         self._index: int = 0
@@ -644,17 +1807,24 @@ class EndpointIdIterator:
         self.list_data: List[Dict[str, Any]] = []
 
         httpx_models_response = {"response": self.response}
+        if self.data is None:
+            try:
+                self.data = decode_response(self.response, self.api.loads)
+            except JSONDecodeError:
+                if self.response.request.method == "DELETE":
+                    self.dict_data = httpx_models_response
+                    return
+                raise httpx.DecodingError("The server returned non json data")
+
         try:
-            self.list_data = self.response.json()["results"]
+            # bulk write requests return a list of objects
+            self.list_data = (
+                self.data if isinstance(self.data, list) else self.data["results"]
+            )
             if len(self.list_data) == 1:
                 self.dict_data = {**httpx_models_response, **self.list_data[0]}
         except KeyError:
-            self.dict_data = {**httpx_models_response, **self.response.json()}
-        except JSONDecodeError:
-            if self.response.request.method == "DELETE":
-                self.dict_data = httpx_models_response
-            else:
-                raise httpx.DecodingError("The server returned non json data")
+            self.dict_data = {**httpx_models_response, **self.data}
 
     async def __call__(self) -> E:
         """EndpointIdIterator object is a service coroutine
@@ -1,4 +1,6 @@
+import json
 from json import JSONDecodeError
+from typing import Any, Callable, Dict, List, Tuple
 
 import httpx
 
@@ -26,10 +28,60 @@ class RequestParamsError(Exception):
         return f"Passing Parameters error for GET method. {self.message}"
 
 
+class BulkError(Exception):
+    """For failed chunks of bulk http requests. The other chunks are already
+    sent, so NetBox objects of 'succeeded' are created/updated/deleted.
+
+    Attributes:
+        method (str): http request action ('post', 'put', 'patch' or 'delete')
+        errors (list): (objects of the failed chunk, exception) tuples
+        succeeded (list): objects of the sent chunks
+        results (list): NetBox objects, returned for the sent chunks. It is empty
+            for 'delete' action
+    """
+
+    def __init__(
+        self,
+        method: str,
+        errors: List[Tuple[List[Dict[str, Any]], Exception]],
+        succeeded: List[Dict[str, Any]],
+        results: List[Dict[str, Any]],
+    ) -> None:
+        super().__init__(errors)
+        self.method = method
+        self.errors = errors
+        self.succeeded = succeeded
+        self.results = results
+
+    def __str__(self) -> str:
+        failed = sum(len(objects) for objects, _ in self.errors)
+        return (
+            f"Bulk {self.method.upper()} error for {failed} objects"
+            f" ({len(self.succeeded)} objects are sent). {self.errors[0][1]}"
+        )
+
+
+class GraphQLError(Exception):
+    """For GraphQL query errors, returned by NetBox with 200 http status code"""
+
+    def __init__(self, errors: List[Dict[str, Any]]) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+    def __str__(self) -> str:
+        messages = "; ".join(str(e.get("message", e)) for e in self.errors)
+        return f"GraphQL query error. {messages}"
+
+
 # classic httpx.Response.raise_for_status() function, but with minor changes
 # https://github.com/encode/httpx/blob/321d4aa5097fe7f24cdfed7191c44de589294780/httpx/_models.py#L1475
-def raise_for_status(response: httpx.Response) -> None:
-    """Raise the `HTTPStatusError` if one occurred."""
+def raise_for_status(
+    response: httpx.Response, loads: Callable[[bytes], Any] = json.loads
+) -> None:
+    """Raise the `HTTPStatusError` if one occurred.
+
+    'loads' is a JSON decoder function for the error response.
+    """
     request = response._request
     if request is None:
         raise RuntimeError(
@@ -70,7 +122,7 @@ def raise_for_status(response: httpx.Response) -> None:
             response,
             error_type=error_type,
             parameters=response.request.content.decode("utf-8"),
-            response_json=response.json(),
+            response_json=loads(response.content),
         )
     except JSONDecodeError:
         raise httpx.DecodingError("The server returned non json data")
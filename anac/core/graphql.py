@@ -0,0 +1,81 @@
+from functools import partial
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .endpoint import DictAttribute, EndpointBase
+from .exceptions import GraphQLError, raise_for_status
+from .tasks import gather_limited
+
+if TYPE_CHECKING:
+    from .api import Api
+
+
+def graphql_url(api: "Api") -> str:
+    """Get NetBox GraphQL API url ('http://netbox/graphql/')"""
+    return f"{api.base_url[: -len('/api')]}/graphql/"
+
+
+async def graphql_query(
+    api: "Api", query: str, variables: Optional[Dict[str, Any]] = None
+) -> DictAttribute:
+    """Send GraphQL query over Api.http_session, see Api.graphql"""
+    # GraphQL queries are reads: they are retried and rate limited as GET
+    # http requests and are passed to Api hooks as '/graphql/' endpoint
+    endpoint = EndpointBase(api, api.base_url, "/graphql/")
+    send = partial(
+        api.http_session.post,
+        graphql_url(api),
+        json={"query": query, "variables": variables or {}},
+        headers={**api.write_headers, "accept": "application/json;"},
+    )
+    if api.hooks:
+        response = await endpoint._send_instrumented("get", send)
+    else:
+        response = await endpoint._send("get", send)
+    raise_for_status(response, loads=api.loads)
+
+    payload = endpoint._decode(response)
+    if payload.get("errors"):
+        raise GraphQLError(payload["errors"])
+    return DictAttribute(payload.get("data") or {})
+
+
+async def graphql_query_all(
+    api: "Api",
+    query: str,
+    variables: Optional[Dict[str, Any]],
+    field: Optional[str],
+    limit: int,
+    concurrency: int,
+) -> List[DictAttribute]:
+    """Page through GraphQL list field, see Api.graphql_all"""
+    if limit < 1:
+        raise ValueError("limit must be greater than 0")
+
+    async def get_page(offset: int) -> List[Any]:
+        data = await graphql_query(
+            api, query, {**(variables or {}), "offset": offset, "limit": limit}
+        )
+        name = field
+        if name is None:
+            if len(data) != 1:
+                raise ValueError(
+                    "GraphQL query has many fields, set 'field' to page through"
+                )
+            name = next(iter(data))
+        return data[name] or []
+
+    rows: List[DictAttribute] = []
+    offset = variables.get("offset", 0) if variables else 0
+    while True:
+        # the total number of objects is unknown, so 'concurrency' pages
+        # are requested at once until a page is not full
+        pages = await gather_limited(
+            (get_page(offset + i * limit) for i in range(concurrency)), concurrency
+        )
+        for page in pages:
+            rows.extend(
+                DictAttribute(row) if type(row) is dict else row for row in page
+            )
+            if len(page) < limit:
+                return rows
+        offset += concurrency * limit
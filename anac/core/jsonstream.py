@@ -0,0 +1,189 @@
+from json import JSONDecodeError
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .decoder import Loads
+
+RESULTS = re.compile(rb'"results"\s*:\s*\[')
+BRACKET = re.compile(rb"[{}\[\]]")
+# everything except brackets: the other bytes and the complete JSON strings
+SKIP = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*', re.DOTALL)
+SEPARATORS = frozenset(b" \t\r\n,")
+OPEN = frozenset(b"{[")
+
+# end of the complete objects, scan position, nesting level, ']' position or -1
+Split = Tuple[int, int, int, int]
+
+
+class ResultsParser:
+    """Incremental parser of NetBox API list endpoint JSON
+    ({"count": 1, "next": null, "previous": null, "results": [{...}, ...]})
+
+    The http response body is fed by chunks. The objects of the 'results' array
+    are decoded with 'loads' as soon as their last byte is fed, so the whole page
+    is never buffered. The other keys ('count', 'next', ...) are returned
+    by close().
+
+    The complete objects of each chunk are found by counting brackets and decoded
+    with one 'loads' call. If brackets inside JSON strings break the count,
+    'loads' fails and the chunk is scanned again, skipping JSON strings.
+
+    Args:
+        loads: JSON decoder function
+
+    Usage:
+        In [1]: parser = ResultsParser(json.loads)
+
+        In [2]: list(parser.feed(b'{"count": 2, "results": [{"id": 1}, {"i'))
+        Out[2]: [{'id': 1}]
+
+        In [3]: list(parser.feed(b'd": 2}]}'))
+        Out[3]: [{'id': 2}]
+
+        In [4]: parser.close()
+        Out[4]: {'count': 2}
+    """
+
+    def __init__(self, loads: Loads) -> None:
+        self.loads = loads
+        self.buffer = bytearray()
+        self.head = b""
+        self.tail = bytearray()
+        self.state = "head"
+        # scan position and nesting level of the incomplete object in the buffer,
+        # kept by the string skipping scan only
+        self.pos = 0
+        self.depth = 0
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        """Feed the next chunk and iterate over the completed 'results' objects"""
+        if self.state == "tail":
+            self.tail += chunk
+            return
+        self.buffer += chunk
+        if self.state == "head":
+            match = RESULTS.search(self.buffer)
+            if match is None:
+                return
+            self.head = bytes(self.buffer[: match.start()])
+            del self.buffer[: match.end()]
+            self.state = "results"
+        yield from self._scan()
+
+    def _scan(self) -> List[Any]:
+        objects: Optional[List[Any]] = None
+        if self.pos == 0:
+            end, pos, depth, close = self._count()
+            # the bracket count is trusted, if the objects are decoded
+            if end:
+                try:
+                    objects = self._decode(end)
+                except JSONDecodeError:
+                    pass
+            elif close >= 0:
+                objects = []
+            # the incomplete object is counted again with the next chunk
+        if objects is None:
+            end, pos, depth, close = self._split()
+            objects = self._decode(end)
+
+        buffer = self.buffer
+        if close >= 0:
+            self.state = "tail"
+            self.tail += buffer[close + 1 :]
+            buffer.clear()
+            self.pos = self.depth = 0
+        else:
+            del buffer[:end]
+            self.pos = pos - end if depth else 0
+            self.depth = depth
+        return objects
+
+    def _count(self) -> Split:
+        """Find the end of the complete 'results' objects in the buffer
+        by counting brackets, including the ones inside JSON strings"""
+        buffer = self.buffer
+        depth = 0
+        end = 0
+        for match in BRACKET.finditer(buffer):
+            pos = match.start()
+            if depth == 0:
+                if buffer[end:pos].strip(b" \t\r\n,"):
+                    break
+                if buffer[pos] == 0x5D:  # ']'
+                    return end, pos, 0, pos
+            if buffer[pos] in OPEN:
+                depth += 1
+            else:
+                depth -= 1
+                if depth < 0:
+                    break
+                if depth == 0:
+                    end = pos + 1
+        return end, 0, 0, -1
+
+    def _split(self) -> Split:
+        """Find the end of the complete 'results' objects in the buffer
+        by counting brackets outside JSON strings"""
+        buffer = self.buffer
+        size = len(buffer)
+        pos = self.pos
+        depth = self.depth
+        end = 0
+        while True:
+            if depth == 0:
+                while pos < size and buffer[pos] in SEPARATORS:
+                    pos += 1
+                if pos >= size:
+                    break
+                if buffer[pos] == 0x5D:  # ']'
+                    return end, pos, 0, pos
+                if buffer[pos] not in OPEN:
+                    raise JSONDecodeError(
+                        "Expecting 'results' object",
+                        buffer.decode(errors="replace"),
+                        pos,
+                    )
+
+            pos = SKIP.match(buffer, pos).end()  # type: ignore[union-attr]
+            # the end of the buffer or an incomplete string
+            if pos >= size or buffer[pos] == 0x22:  # '"'
+                break
+            if buffer[pos] in OPEN:
+                depth += 1
+            else:
+                depth -= 1
+            pos += 1
+            if depth == 0:
+                end = pos
+        return end, pos, depth, -1
+
+    def _decode(self, end: int) -> List[Any]:
+        """Decode the complete objects in the buffer with one 'loads' call"""
+        buffer = self.buffer
+        start = 0
+        while start < end and buffer[start] in SEPARATORS:
+            start += 1
+        if start >= end:
+            return []
+        objects: List[Any] = self.loads(b"[" + bytes(buffer[start:end]) + b"]")
+        return objects
+
+    def close(self) -> Dict[str, Any]:
+        """Get the keys of JSON object except 'results'
+
+        Raises:
+            json.JSONDecodeError: If JSON is incomplete or there is no 'results' key
+        """
+        if self.state != "tail":
+            # the error does not depend on 'loads' decoder
+            doc = (self.head + bytes(self.buffer)).decode(errors="replace")
+            if self.state == "head":
+                raise JSONDecodeError("Expecting 'results' key", doc, len(doc))
+            raise JSONDecodeError("Incomplete 'results' array", doc, len(doc))
+        head = self.head.rstrip().rstrip(b",")
+        tail = bytes(self.tail).strip()
+        if head.endswith(b"{") and tail.startswith(b","):
+            tail = tail[1:]
+        meta: Dict[str, Any] = self.loads(head + tail)
+        return meta
@@ -0,0 +1,196 @@
+from collections import deque
+import dataclasses
+from importlib import import_module
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+
+# decoded JSON of the instrumented http response, see decode_response()
+DECODED = "anac.decoded"
+
+
+@dataclasses.dataclass
+class RequestEvent:
+    """Event of the finished Endpoint* http request, passed to Api hooks
+
+    Args:
+        endpoint (str): NetBox API endpoint ('/dcim/devices/{id}/', ...)
+        method (str): http method
+        status (int): http response status code. None, if http request failed
+        latency (float): http request time including retries, in seconds
+        bytes_in (int): http response body size
+        bytes_out (int): http request body size
+        retries (int): Number of retries
+        decode_time (float): http response JSON decode time, in seconds. None,
+            if http response is not JSON
+        error (Exception): Exception of the failed http request
+    """
+
+    endpoint: str
+    method: str
+    status: Optional[int]
+    latency: float
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    decode_time: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+def decode_response(response: httpx.Response, loads: Any) -> Any:
+    """Decode http response JSON once. Instrumented http responses are decoded
+    in EndpointBase._request to measure decode time"""
+    data = response.extensions.get(DECODED, DECODED)
+    if data is DECODED:
+        return loads(response.content)
+    return data
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Get 'q' percentile (0-100) of sorted 'values' (nearest rank)"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, -(-len(values) * q // 100) - 1))
+    return values[int(index)]
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    """Aggregated RequestEvent stats of NetBox API endpoint"""
+
+    window: int
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    decode_time: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.latencies: Deque[float] = deque(maxlen=self.window)
+
+    def add(self, event: RequestEvent) -> None:
+        self.count += 1
+        if event.error is not None or (event.status or 0) >= 400:
+            self.errors += 1
+        self.retries += event.retries
+        self.bytes_in += event.bytes_in
+        self.bytes_out += event.bytes_out
+        self.decode_time += event.decode_time or 0.0
+        self.latencies.append(event.latency)
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "decode_time": self.decode_time,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+
+
+class Metrics:
+    """Api hook with latency histograms of NetBox API endpoints
+
+    The latency percentiles are calculated over the last 'window' http requests
+    of each NetBox API endpoint.
+
+    Args:
+        window (int): Number of the latest latencies, kept for each endpoint
+
+    Usage:
+        In [1]: from anac import api, Metrics
+           ...:
+           ...: metrics = Metrics()
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...:     hooks=[metrics],
+           ...: )
+           ...: await a.openapi()
+
+        In [2]: devices = await a.dcim_devices.get_all()
+
+        In [3]: metrics.summary()["/dcim/devices/"]
+        Out[3]:
+        {'count': 5,
+         'errors': 0,
+         'retries': 0,
+         'bytes_in': 2361915,
+         'bytes_out': 0,
+         'decode_time': 0.0209,
+         'p50': 0.2125,
+         'p95': 0.2813,
+         'p99': 0.2813}
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self.window = window
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        stats = self.endpoints.get(event.endpoint)
+        if stats is None:
+            stats = self.endpoints[event.endpoint] = EndpointStats(self.window)
+        stats.add(event)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Get stats and p50/p95/p99 latencies (seconds) by NetBox API endpoint"""
+        return {endpoint: stats.summary() for endpoint, stats in self.endpoints.items()}
+
+    def clear(self) -> None:
+        self.endpoints.clear()
+
+
+class OpenTelemetryHook:
+    """Api hook, recording RequestEvent into OpenTelemetry metrics:
+    'http.client.duration' (s), 'http.client.request.size' (By),
+    'http.client.response.size' (By) histograms and 'anac.retries' counter.
+
+    Requires 'opentelemetry-api' package (pip install opentelemetry-api).
+
+    Args:
+        meter (opentelemetry.metrics.Meter): OpenTelemetry meter. By default,
+            the 'anac' meter of the global meter provider is used
+
+    Usage:
+        In [1]: from anac import api, OpenTelemetryHook
+           ...:
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...:     hooks=[OpenTelemetryHook()],
+           ...: )
+    """
+
+    def __init__(self, meter: Any = None) -> None:
+        if meter is None:
+            meter = import_module("opentelemetry.metrics").get_meter("anac")
+        self.duration = meter.create_histogram("http.client.duration", unit="s")
+        self.request_size = meter.create_histogram(
+            "http.client.request.size", unit="By"
+        )
+        self.response_size = meter.create_histogram(
+            "http.client.response.size", unit="By"
+        )
+        self.retries = meter.create_counter("anac.retries")
+
+    def __call__(self, event: RequestEvent) -> None:
+        attributes: Dict[str, Any] = {
+            "http.method": event.method,
+            "http.route": event.endpoint,
+        }
+        if event.status is not None:
+            attributes["http.status_code"] = event.status
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+        self.duration.record(event.latency, attributes)
+        self.request_size.record(event.bytes_out, attributes)
+        self.response_size.record(event.bytes_in, attributes)
+        if event.retries:
+            self.retries.add(event.retries, attributes)
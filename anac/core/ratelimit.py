@@ -0,0 +1,95 @@
+import asyncio
+import dataclasses
+import time
+from typing import List, Optional
+
+
+@dataclasses.dataclass
+class TokenBucket:
+    """Token bucket with 'rate' tokens per second and 'burst' bucket size
+
+    Each acquire() takes a token. If there are no tokens, the token is reserved
+    and acquire() sleeps until it is refilled, so concurrent callers get tokens
+    in the acquire() order without locks.
+    """
+
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate and burst must be greater than 0")
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and get delay in seconds until it is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclasses.dataclass
+class RateLimiter:
+    """Client-side rate limiter for NetBox API http requests
+
+    Each http request takes a token from the shared bucket ('rate'/'burst')
+    and from the bucket of its method: GET http requests from the read bucket
+    ('read_rate'/'read_burst'), POST/PUT/PATCH/DELETE http requests
+    from the write bucket ('write_rate'/'write_burst'). The bucket is not used,
+    if its rate is None.
+
+    Args:
+        rate (float): Shared requests per second for all http methods
+        burst (int): Shared bucket size
+        read_rate (float): GET requests per second
+        read_burst (int): GET bucket size
+        write_rate (float): POST/PUT/PATCH/DELETE requests per second
+        write_burst (int): POST/PUT/PATCH/DELETE bucket size
+
+    Usage:
+        In [1]: from anac import api, RateLimiter
+           ...:
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...:     rate_limiter=RateLimiter(rate=50, burst=10, write_rate=5),
+           ...: )
+           ...: await a.openapi()
+    """
+
+    rate: Optional[float] = None
+    burst: int = 1
+    read_rate: Optional[float] = None
+    read_burst: int = 1
+    write_rate: Optional[float] = None
+    write_burst: int = 1
+
+    def __post_init__(self) -> None:
+        self.shared = None if self.rate is None else TokenBucket(self.rate, self.burst)
+        self.read = (
+            None
+            if self.read_rate is None
+            else TokenBucket(self.read_rate, self.read_burst)
+        )
+        self.write = (
+            None
+            if self.write_rate is None
+            else TokenBucket(self.write_rate, self.write_burst)
+        )
+
+    async def acquire(self, method: str) -> None:
+        """Wait for a token for 'method' http request"""
+        bucket = self.read if method.upper() == "GET" else self.write
+        buckets: List[TokenBucket] = [b for b in (self.shared, bucket) if b]
+        # reserve all tokens at once, then wait for the slowest of them
+        delay = max((b.reserve() for b in buckets), default=0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
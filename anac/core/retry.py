@@ -0,0 +1,132 @@
+import asyncio
+import dataclasses
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+from typing import Awaitable, Callable, FrozenSet, Optional, Tuple, Type
+
+import httpx
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_EXCEPTIONS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+# idempotent http methods, see RFC 7231
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclasses.dataclass
+class RetryPolicy:
+    """Retry policy for NetBox API http requests
+
+    Failed http requests are retried with exponential backoff and full jitter:
+    the delay before the n-th retry is a random value between 0 and
+    min(max_backoff, backoff_factor * 2 ** (n - 1)) seconds. If NetBox response
+    has 'Retry-After' http header, its delay is used instead.
+
+    Args:
+        max_attempts (int): Max number of attempts, including the first one
+        statuses (frozenset): http response status codes to retry
+        exceptions (tuple): httpx exceptions to retry
+        methods (frozenset): http methods to retry. By default, only idempotent
+            methods are retried, so POST and PATCH http requests are never repeated
+        backoff_factor (float): Backoff factor, in seconds
+        max_backoff (float): Max delay between attempts, in seconds
+        respect_retry_after (bool): Use 'Retry-After' http header delay
+
+    Attributes:
+        retries (int): Number of retried http requests
+        give_ups (int): Number of http requests, failed after max_attempts
+
+    Usage:
+        In [1]: from anac import api, RetryPolicy
+           ...:
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...:     retry=RetryPolicy(max_attempts=5),
+           ...: )
+           ...: await a.openapi()
+
+        In [2]: a.retry.retries, a.retry.give_ups
+        Out[2]: (0, 0)
+    """
+
+    max_attempts: int = 3
+    statuses: FrozenSet[int] = RETRY_STATUSES
+    exceptions: Tuple[Type[Exception], ...] = RETRY_EXCEPTIONS
+    methods: FrozenSet[str] = RETRY_METHODS
+    backoff_factor: float = 0.5
+    max_backoff: float = 60.0
+    respect_retry_after: bool = True
+    retries: int = dataclasses.field(default=0, init=False)
+    give_ups: int = dataclasses.field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self.random = random.SystemRandom()
+
+    def retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Get 'Retry-After' http header delay in seconds (RFC 7231)"""
+        value = response.headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Get delay in seconds before the next attempt"""
+        if response is not None and self.respect_retry_after:
+            delay = self.retry_after(response)
+            if delay is not None:
+                return min(delay, self.max_backoff)
+        return self.random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        )
+
+    async def send(
+        self, method: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Send http request with 'send' coroutine function and retry it
+        according to the policy
+
+        Returns:
+            httpx.Response: The last response. If all attempts failed with
+            'statuses', the last failed response is returned
+
+        Raises:
+            httpx._exceptions: The last exception, if all attempts failed with
+            'exceptions'
+        """
+        if method.upper() not in self.methods:
+            return await send()
+
+        attempt = 1
+        while True:
+            response: Optional[httpx.Response] = None
+            try:
+                response = await send()
+            except self.exceptions:
+                if attempt >= self.max_attempts:
+                    self.give_ups += 1
+                    raise
+            else:
+                if response.status_code not in self.statuses:
+                    return response
+                if attempt >= self.max_attempts:
+                    self.give_ups += 1
+                    return response
+
+            await asyncio.sleep(self.backoff(attempt, response))
+            self.retries += 1
+            attempt += 1
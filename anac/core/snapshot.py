@@ -0,0 +1,336 @@
+from importlib import import_module
+import json
+from pathlib import Path
+import sqlite3
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set
+
+from .endpoint import Endpoint
+from .tasks import gather_limited
+
+
+def table_name(endpoint: str) -> str:
+    """Get snapshot table name for NetBox API list endpoint
+    ('/dcim/device-types/' -> 'dcim_device_types')"""
+    return endpoint.strip("/").replace("/", "_").replace("-", "_")
+
+
+def flatten(
+    data: Dict[str, Any], references: Optional[Set[str]] = None
+) -> Dict[str, Any]:
+    """Flatten NetBox object into a table row.
+
+    Nested NetBox object references are replaced with foreign key columns
+    ('site': {'id': 1, ...} -> 'site_id': 1), choices are replaced with
+    their values ('status': {'value': 'active', ...} -> 'status': 'active'),
+    the other dicts and lists are serialized to JSON.
+
+    The reference keys are added to 'references', so the null references
+    of the next objects are foreign key columns too ('tenant': None ->
+    'tenant_id': None).
+    """
+    row: Dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            if "id" in value:
+                row[f"{key}_id"] = value["id"]
+                if references is not None:
+                    references.add(key)
+            elif "value" in value:
+                row[key] = value["value"]
+            else:
+                row[key] = json.dumps(value)
+        elif isinstance(value, list):
+            row[key] = json.dumps(value)
+        elif value is None and references and key in references:
+            row[f"{key}_id"] = None
+        else:
+            row[key] = value
+    return row
+
+
+def new_columns(
+    rows: List[Dict[str, Any]], columns: Iterable[str], nulls: Dict[str, None]
+) -> List[str]:
+    """Get the row keys with values, missing in 'columns'. The keys with null
+    values only are added to 'nulls': their type is unknown yet ('tenant' may be
+    'tenant_id' foreign key column), so their columns are created on close"""
+    columns = set(columns)
+    new = []
+    for key in {k: None for row in rows for k in row}:
+        if key in columns:
+            continue
+        if any(row.get(key) is not None for row in rows):
+            new.append(key)
+            nulls.pop(key, None)
+        else:
+            nulls[key] = None
+    return new
+
+
+def null_columns(columns: Iterable[str], nulls: Dict[str, None]) -> List[str]:
+    """Get the columns of the keys with null values only. The null references
+    are already in the foreign key columns"""
+    columns = set(columns)
+    return [k for k in nulls if k not in columns and f"{k}_id" not in columns]
+
+
+def quote_name(name: str) -> str:
+    """Quote SQLite identifier"""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+class SQLiteWriter:
+    """Snapshot writer to SQLite database. Each NetBox API endpoint is a table
+    with the 'id' primary key. New columns are added on the fly, the columns
+    with null values only are added on close"""
+
+    def __init__(self, path: Path) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.columns: Dict[str, List[str]] = {}
+        self.nulls: Dict[str, Dict[str, None]] = {}
+
+    def add_columns(self, table: str, keys: Iterable[str]) -> None:
+        columns = self.columns[table]
+        for key in keys:
+            self.db.execute(
+                f"ALTER TABLE {quote_name(table)} ADD COLUMN {quote_name(key)}"
+            )
+            columns.append(key)
+
+    def write(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        name = quote_name(table)
+        columns = self.columns.get(table)
+        if columns is None:
+            self.db.execute(f"DROP TABLE IF EXISTS {name}")
+            self.db.execute(f'CREATE TABLE {name} ("id" PRIMARY KEY)')
+            columns = self.columns[table] = ["id"]
+        nulls = self.nulls.setdefault(table, {})
+        self.add_columns(table, new_columns(rows, columns, nulls))
+
+        names = ", ".join(map(quote_name, columns))
+        values = ", ".join("?" for _ in columns)
+        self.db.executemany(
+            f"INSERT OR REPLACE INTO {name} ({names}) VALUES ({values})",  # nosec
+            ([row.get(c) for c in columns] for row in rows),
+        )
+        self.db.commit()
+
+    def close(self) -> None:
+        for table, nulls in self.nulls.items():
+            self.add_columns(table, null_columns(self.columns[table], nulls))
+        self.db.commit()
+        self.db.close()
+
+
+class ParquetWriter:
+    """Snapshot writer to Parquet files, one '<table>.parquet' file
+    for each NetBox API endpoint in 'path' directory.
+
+    The schema is taken from the first page. When a new column appears on the
+    next pages, the schema is extended and the written rows are rewritten with
+    null values of the new column. When the values of the next pages do not fit
+    the column type (int custom field with str values, ...), the column is
+    widened to string and the written rows are rewritten the same way. The columns
+    with null values only are string columns, added on close. Requires 'pyarrow'
+    package (pip install pyarrow).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.pa = import_module("pyarrow")
+        self.pq = import_module("pyarrow.parquet")
+        self.path = Path(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.writers: Dict[str, Any] = {}
+        self.nulls: Dict[str, Dict[str, None]] = {}
+
+    def strings(self, values: List[Any]) -> Any:
+        """Get string array of 'values'"""
+        return self.pa.array(
+            [v if v is None or isinstance(v, str) else str(v) for v in values],
+            self.pa.string(),
+        )
+
+    def field(self, name: str, values: List[Any], type_: Any = None) -> Any:
+        """Get the column field of 'values' with 'type_' (inferred, if None).
+        It is a string field, if the values do not fit the type"""
+        pa = self.pa
+        try:
+            type_ = pa.array(values, type_).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            type_ = pa.string()
+        if pa.types.is_null(type_):
+            type_ = pa.string()
+        return pa.field(name, type_)
+
+    def extend(self, table: str, fields: List[Any], widen: Iterable[str] = ()) -> Any:
+        """Open the table writer with the new 'fields' and the 'widen' columns
+        changed to string, and rewrite the written rows"""
+        pa = self.pa
+        widen = set(widen)
+        path = self.path / f"{table}.parquet"
+        written = None
+        writer = self.writers.pop(table, None)
+        if writer is not None:
+            writer.close()
+            written = self.pq.read_table(path)
+            fields = [
+                pa.field(f.name, pa.string()) if f.name in widen else f
+                for f in writer.schema
+            ] + fields
+        writer = self.writers[table] = self.pq.ParquetWriter(path, pa.schema(fields))
+        if written is not None:
+            columns = []
+            for field in writer.schema:
+                if field.name not in written.column_names:
+                    columns.append(pa.nulls(written.num_rows, field.type))
+                elif field.name in widen:
+                    columns.append(self.strings(written.column(field.name).to_pylist()))
+                else:
+                    columns.append(written.column(field.name))
+            writer.write_table(pa.Table.from_arrays(columns, schema=writer.schema))
+        return writer
+
+    def write(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        pa = self.pa
+        writer = self.writers.get(table)
+        nulls = self.nulls.setdefault(table, {})
+        new = new_columns(rows, [] if writer is None else writer.schema.names, nulls)
+        if writer is None or new:
+            writer = self.extend(
+                table, [self.field(k, [row.get(k) for row in rows]) for k in new]
+            )
+        schema = writer.schema
+        try:
+            data = pa.Table.from_pylist(rows, schema=schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # the values do not fit the column types: str values of int column,
+            # int values of string column, ...
+            values = {f.name: [row.get(f.name) for row in rows] for f in schema}
+            widen = [
+                f.name
+                for f in schema
+                if not pa.types.is_string(f.type)
+                and pa.types.is_string(self.field(f.name, values[f.name], f.type).type)
+            ]
+            if widen:
+                writer = self.extend(table, [], widen)
+                schema = writer.schema
+            data = pa.Table.from_arrays(
+                [
+                    self.strings(values[f.name])
+                    if pa.types.is_string(f.type)
+                    else pa.array(values[f.name], f.type)
+                    for f in schema
+                ],
+                schema=schema,
+            )
+        writer.write_table(data)
+
+    def close(self) -> None:
+        for table, nulls in self.nulls.items():
+            columns = null_columns(self.writers[table].schema.names, nulls)
+            if columns:
+                self.extend(
+                    table, [self.pa.field(k, self.pa.string()) for k in columns]
+                )
+        for writer in self.writers.values():
+            writer.close()
+
+
+async def export_table(
+    endpoint: Endpoint,
+    writer: Any,
+    get: Optional[Dict[str, Any]],
+    limit: int,
+) -> int:
+    table = table_name(endpoint.endpoint)
+    references: Set[str] = set()
+    count = 0
+    rows: List[Dict[str, Any]] = []
+    async for obj in endpoint.stream(get=get, limit=limit, raw=True):
+        rows.append(flatten(obj, references))
+        if len(rows) >= limit:
+            writer.write(table, rows)
+            count += len(rows)
+            rows = []
+    if rows or not count:
+        writer.write(table, rows)
+        count += len(rows)
+    return count
+
+
+async def export_snapshot(
+    endpoints: Iterable[Endpoint],
+    path: Path,
+    output: Literal["sqlite", "parquet"] = "sqlite",
+    get: Optional[Dict[str, Any]] = None,
+    limit: int = 1000,
+    concurrency: int = 4,
+) -> Dict[str, int]:
+    """Export NetBox objects of the list endpoints into a local snapshot
+    for offline analytics.
+
+    The endpoints are paged through concurrently with Endpoint.stream in raw
+    mode, each page is flattened (see flatten()) and written into the snapshot,
+    so all NetBox objects are never kept in memory.
+
+    Args:
+        endpoints: Endpoint objects (a.dcim_devices, a.ipam_ip_addresses, ...)
+        path (pathlib.Path): SQLite database file or Parquet files directory
+        output (str): Snapshot format: 'sqlite' or 'parquet'. 'parquet' requires
+            'pyarrow' package
+        get (dict): http request params (filters) for all endpoints
+        limit (int): Page size
+        concurrency (int): Max number of concurrently exported endpoints
+
+    Returns:
+        dict with the number of exported NetBox objects by table name
+
+    Raises:
+        httpx._exceptions:
+            See https://github.com/encode/httpx/blob/master/httpx/_exceptions.py
+        ModuleNotFoundError: If 'parquet' output is used without 'pyarrow'
+
+    Usage:
+        In [1]: from anac import api, export_snapshot
+           ...:
+           ...: a = api(
+           ...:     "http://netbox/",
+           ...:     token="api_token",
+           ...: )
+           ...: await a.openapi()
+
+        In [2]: await export_snapshot(
+           ...:     [a.dcim_devices, a.dcim_interfaces, a.ipam_ip_addresses],
+           ...:     "netbox.db",
+           ...: )
+        Out[2]: {'dcim_devices': 4010, 'dcim_interfaces': 80000,
+        'ipam_ip_addresses': 12000}
+
+        In [3]: import sqlite3
+           ...:
+           ...: db = sqlite3.connect("netbox.db")
+           ...: db.execute(
+           ...:     "SELECT d.name, count(*) FROM dcim_interfaces i"
+           ...:     " JOIN dcim_devices d ON i.device_id = d.id GROUP BY d.id"
+           ...: ).fetchone()
+        Out[3]: ('test', 48)
+    """
+    writer: Any
+    if output == "sqlite":
+        writer = SQLiteWriter(path)
+    elif output == "parquet":
+        writer = ParquetWriter(path)
+    else:
+        raise ValueError("Available outputs: 'sqlite', 'parquet'")
+
+    endpoints = [*endpoints]
+    try:
+        counts = await gather_limited(
+            (export_table(e, writer, get, limit) for e in endpoints), concurrency
+        )
+    finally:
+        writer.close()
+    return {table_name(e.endpoint): c for e, c in zip(endpoints, counts)}
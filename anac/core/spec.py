@@ -0,0 +1,65 @@
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, Optional
+
+from .decoder import Loads
+
+
+class SpecCache:
+    """On-disk cache of NetBox openapi spec
+
+    One cache file is kept for each NetBox url. The file contains the openapi spec,
+    NetBox version and 'ETag'/'Last-Modified' http response headers to revalidate
+    the spec.
+
+    Args:
+        cache_dir (pathlib.Path): Cache directory
+        url (str): NetBox API url
+        loads: JSON decoder function
+    """
+
+    def __init__(self, cache_dir: Path, url: str, loads: Loads = json.loads) -> None:
+        self.url = url
+        self.loads = loads
+        name = sha256(url.encode()).hexdigest()[:32]
+        self.path = cache_dir.expanduser() / f"{name}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the cache file. Returns None, if there is no valid cache file"""
+        try:
+            with open(self.path, "rb") as f:
+                cached = self.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("url") != self.url:
+            return None
+        return cached
+
+    def save(
+        self,
+        spec: Dict[str, Any],
+        version: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Write the cache file atomically, so concurrent workers never read
+        a partially written file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        cached = {
+            "url": self.url,
+            "version": version,
+            "etag": etag,
+            "last_modified": last_modified,
+            "spec": spec,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cached, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
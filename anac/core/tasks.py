@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Tuple
+
+
+async def gather_limited(
+    aws: Iterable[Awaitable[Any]],
+    concurrency: int,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Run awaitables with at most 'concurrency' of them in flight
+
+    Awaitables are pulled from 'aws' lazily, so coroutines from a generator
+    are created only when a worker is free. Results are returned in input order,
+    like asyncio.gather.
+
+    Args:
+        aws: iterable with awaitables (coroutines, tasks, futures)
+        concurrency (int): max number of awaitables in flight
+        return_exceptions (bool): If True, exceptions are returned in place
+            of the results and the other awaitables keep running. If False,
+            the first exception cancels the remaining awaitables and is raised
+
+    Returns:
+        list with results in input order
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be greater than 0")
+
+    results: Dict[int, Any] = {}
+    iterator = enumerate(aws)
+
+    async def worker() -> None:
+        for index, aw in iterator:
+            try:
+                results[index] = await aw
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+    return [results[index] for index in range(len(results))]
+
+
+async def as_completed_limited(
+    aws: Iterable[Awaitable[Any]],
+    concurrency: int,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Run awaitables with at most 'concurrency' of them in flight and yield
+    (index, result) tuples in completion order
+
+    Exceptions are yielded in place of the results, the other awaitables
+    keep running.
+
+    Args:
+        aws: iterable with awaitables (coroutines, tasks, futures)
+        concurrency (int): max number of awaitables in flight
+
+    Returns:
+        async generator with (input index, result or exception) tuples
+
+    Raises:
+        ValueError: If concurrency is less than 1
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be greater than 0")
+
+    iterator = enumerate(aws)
+    pending: Dict["asyncio.Future[Any]", int] = {}
+
+    def schedule() -> None:
+        while len(pending) < concurrency:
+            item = next(iterator, None)
+            if item is None:
+                break
+            pending[asyncio.ensure_future(item[1])] = item[0]
+
+    try:
+        schedule()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if future.cancelled():
+                    yield index, asyncio.CancelledError()
+                elif future.exception() is not None:
+                    yield index, future.exception()
+                else:
+                    yield index, future.result()
+            schedule()
+    finally:
+        for future in pending:
+            future.cancel()
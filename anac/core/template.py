@@ -0,0 +1,48 @@
+from functools import lru_cache
+import re
+from typing import Any, Dict, Tuple
+
+PARAM = re.compile(r"{(\w+)}")
+
+
+class UrlTemplate:
+    """Compiled NetBox API endpoint URL template
+    ('/dcim/devices/{id}/napalm/' -> ('/dcim/devices/', '/napalm/'), ('id',))
+
+    Args:
+        endpoint (str): NetBox API endpoint with '{param}' path parameters
+    """
+
+    __slots__ = ("endpoint", "literals", "params")
+
+    def __init__(self, endpoint: str) -> None:
+        parts = PARAM.split(endpoint)
+        self.endpoint = endpoint
+        self.literals: Tuple[str, ...] = tuple(parts[0::2])
+        self.params: Tuple[str, ...] = tuple(parts[1::2])
+
+    def format(self, base_url: str, values: Dict[str, Any]) -> str:
+        """Get http request URL with the path parameter 'values'
+
+        Raises:
+            KeyError: If 'values' has no path parameter
+            TypeError: If 'values' is not a dict
+        """
+        params = self.params
+        if not params:
+            return f"{base_url}{self.endpoint}"
+        literals = self.literals
+        if len(params) == 1:
+            return f"{base_url}{literals[0]}{values[params[0]]}{literals[1]}"
+        parts = [base_url, literals[0]]
+        for param, literal in zip(params, literals[1:]):
+            parts.append(str(values[param]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def compile_template(endpoint: str) -> UrlTemplate:
+    """Get compiled URL template of NetBox API endpoint. Each endpoint
+    is parsed once"""
+    return UrlTemplate(endpoint)
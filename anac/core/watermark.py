@@ -0,0 +1,187 @@
+from abc import ABC, abstractmethod
+import dataclasses
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import re
+import sqlite3
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+from urllib.parse import urlencode
+
+if TYPE_CHECKING:
+    from .endpoint import EndpointId
+
+
+FRACTION = re.compile(r"\.(\d+)")
+
+
+@dataclasses.dataclass
+class Watermark:
+    """State of the incremental sync of NetBox API list endpoint
+
+    Args:
+        last_updated (str): The latest 'last_updated' value of the synced
+            NetBox objects
+        ids (list): ids of all NetBox objects on the last sync. It is set,
+            if the deleted NetBox objects are reconciled
+    """
+
+    last_updated: Optional[str] = None
+    ids: Optional[List[int]] = None
+
+
+@dataclasses.dataclass
+class Changes:
+    """Result of the incremental sync
+
+    Args:
+        objects (list): Created or updated EndpointId objects
+        deleted (list): ids of the deleted NetBox objects
+        watermark (Watermark): New watermark, saved into the store
+    """
+
+    objects: List["EndpointId"]
+    deleted: List[int]
+    watermark: Watermark
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse NetBox 'last_updated' timestamp. Timestamps without time zone
+    are UTC"""
+    if value.endswith("Z"):
+        value = f"{value[:-1]}+00:00"
+    # datetime.fromisoformat takes 6 fractional digits only before Python 3.11
+    value = FRACTION.sub(lambda m: f".{m.group(1)[:6]:0<6}", value)
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+def latest(values: Iterable[Optional[str]]) -> Optional[str]:
+    """Get the latest timestamp of 'values' as is. The timestamps are compared
+    as datetimes, so the formats (fractional seconds, UTC offsets) may differ"""
+    timestamps: List[str] = [v for v in values if v]
+    if not timestamps:
+        return None
+    return max(timestamps, key=parse_timestamp)
+
+
+def watermark_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Get watermark store key for NetBox API list endpoint and its filters
+    ('/dcim/devices/', {'site': 'test'} -> '/dcim/devices/?site=test')"""
+    return f"{endpoint}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+class WatermarkStore(ABC):
+    """Base class of the watermark stores"""
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[Watermark]:
+        """Get the saved watermark or None"""
+
+    @abstractmethod
+    def save(self, key: str, watermark: Watermark) -> None:
+        """Save the watermark"""
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """In-memory watermark store"""
+
+    def __init__(self) -> None:
+        self.watermarks: Dict[str, Watermark] = {}
+
+    def load(self, key: str) -> Optional[Watermark]:
+        return self.watermarks.get(key)
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        self.watermarks[key] = watermark
+
+
+class JSONWatermarkStore(WatermarkStore):
+    """Watermark store in a JSON file. The file is rewritten atomically
+    on each save()
+
+    Args:
+        path (pathlib.Path): JSON file path
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path).expanduser()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def load(self, key: str) -> Optional[Watermark]:
+        data = self._read().get(key)
+        return None if data is None else Watermark(**data)
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        data = self._read()
+        data[key] = dataclasses.asdict(watermark)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class SQLiteWatermarkStore(WatermarkStore):
+    """Watermark store in a SQLite database
+
+    Args:
+        path (pathlib.Path): SQLite database path
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = self._connect()
+        try:
+            with db:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS watermarks"
+                    " (key TEXT PRIMARY KEY, last_updated TEXT, ids TEXT)"
+                )
+        finally:
+            db.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def load(self, key: str) -> Optional[Watermark]:
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT last_updated, ids FROM watermarks WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        return Watermark(
+            last_updated=row[0], ids=None if row[1] is None else json.loads(row[1])
+        )
+
+    def save(self, key: str, watermark: Watermark) -> None:
+        ids = None if watermark.ids is None else json.dumps(watermark.ids)
+        db = self._connect()
+        try:
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)",
+                    (key, watermark.last_updated, ids),
+                )
+        finally:
+            db.close()
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def run():
+    """Run coroutine function in a new event loop for each benchmark round"""
+
+    def run(coro_func, *args, **kwargs):
+        return asyncio.run(coro_func(*args, **kwargs))
+
+    return run
+
+
+@pytest.fixture
+def throughput(benchmark):
+    """Save 'count' per second of the mean round time into benchmark
+    'name' extra info. There are no stats with --benchmark-disable"""
+
+    def throughput(name, count):
+        if benchmark.stats:
+            benchmark.extra_info[name] = count / benchmark.stats["mean"]
+
+    return throughput
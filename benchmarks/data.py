@@ -0,0 +1,69 @@
+from typing import Any, Dict, List
+
+
+def device(i: int) -> Dict[str, Any]:
+    """Synthetic NetBox '/dcim/devices/' object"""
+    url = "https://netbox.local/api"
+    return {
+        "id": i,
+        "url": f"{url}/dcim/devices/{i}/",
+        "display": f"device{i}",
+        "name": f"device{i}",
+        "device_type": {
+            "id": i % 20,
+            "url": f"{url}/dcim/device-types/{i % 20}/",
+            "display": "C9200-48P",
+            "manufacturer": {
+                "id": 1,
+                "url": f"{url}/dcim/manufacturers/1/",
+                "display": "Cisco",
+                "name": "Cisco",
+                "slug": "cisco",
+            },
+            "model": "C9200-48P",
+            "slug": "c9200-48p",
+        },
+        "device_role": {
+            "id": 1,
+            "url": f"{url}/dcim/device-roles/1/",
+            "display": "Access Switch",
+            "name": "Access Switch",
+            "slug": "access-switch",
+        },
+        "tenant": None,
+        "platform": None,
+        "serial": f"FOC{i:08d}",
+        "asset_tag": None,
+        "site": {
+            "id": i % 50,
+            "url": f"{url}/dcim/sites/{i % 50}/",
+            "display": f"site{i % 50}",
+            "name": f"site{i % 50}",
+            "slug": f"site{i % 50}",
+        },
+        "location": None,
+        "rack": None,
+        "position": None,
+        "face": None,
+        "parent_device": None,
+        "status": {"value": "active", "label": "Active"},
+        "airflow": None,
+        "primary_ip": None,
+        "primary_ip4": None,
+        "primary_ip6": None,
+        "cluster": None,
+        "virtual_chassis": None,
+        "vc_position": None,
+        "vc_priority": None,
+        "comments": "",
+        "local_context_data": None,
+        "tags": [],
+        "custom_fields": {"Support Contract": None, "owner": "noc"},
+        "config_context": {"ntp": ["10.0.0.1", "10.0.0.2"], "syslog": "10.0.0.3"},
+        "created": "2022-05-15",
+        "last_updated": "2022-05-15T09:45:19.123456Z",
+    }
+
+
+def devices(count: int) -> List[Dict[str, Any]]:
+    return [device(i) for i in range(1, count + 1)]
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.data import devices
+
+API = "/api"
+
+
+def openapi_spec(paths: int) -> Dict[str, Any]:
+    """Synthetic NetBox openapi spec with 'paths' list endpoints
+    and their '{id}' endpoints"""
+    spec_paths: Dict[str, Any] = {"/dcim/devices/": {}, "/dcim/devices/{id}/": {}}
+    for i in range(paths - 1):
+        endpoint = f"/app{i // 20}/model-{i}/"
+        spec_paths[endpoint] = {"get": {"operationId": f"app{i // 20}_model_{i}_list"}}
+        spec_paths[f"{endpoint}{{id}}/"] = {
+            "get": {"operationId": f"app{i // 20}_model_{i}_read"}
+        }
+    return {
+        "info": {"title": "NetBox API", "version": "3.2.0 (3.2)"},
+        "paths": spec_paths,
+    }
+
+
+class MockNetBox:
+    """Local stand-in NetBox for the offline benchmarks.
+
+    It serves the openapi spec, '/api/status/' and '/dcim/devices/' with
+    'count' synthetic devices through httpx.MockTransport, so no network
+    and no NetBox are needed. Each http response is delayed with 'latency'
+    seconds. The list pages are serialized once and reused.
+
+    Args:
+        count (int): Number of devices
+        latency (float): http response delay, in seconds
+        max_page_size (int): NetBox MAX_PAGE_SIZE setting
+        paths (int): Number of list endpoints in the openapi spec
+    """
+
+    def __init__(
+        self,
+        count: int = 10_000,
+        latency: float = 0.0,
+        max_page_size: int = 1000,
+        paths: int = 300,
+    ) -> None:
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.devices = devices(count)
+        self.spec = json.dumps(openapi_spec(paths)).encode()
+        self.pages: Dict[Tuple[int, int], bytes] = {}
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def page(self, request: httpx.Request) -> bytes:
+        limit = int(request.url.params.get("limit", 50)) or self.max_page_size
+        limit = min(limit, self.max_page_size)
+        offset = int(request.url.params.get("offset", 0))
+        page = self.pages.get((offset, limit))
+        if page is None:
+            count = len(self.devices)
+            next_ = None
+            if offset + limit < count:
+                next_ = str(request.url.copy_merge_params({"offset": offset + limit}))
+            page = self.pages[(offset, limit)] = json.dumps(
+                {
+                    "count": count,
+                    "next": next_,
+                    "previous": None,
+                    "results": self.devices[offset : offset + limit],
+                }
+            ).encode()
+        return page
+
+    def write(self, request: httpx.Request) -> bytes:
+        data = json.loads(request.content)
+        if isinstance(data, list):
+            objects: List[Dict[str, Any]] = [
+                {**self.devices[obj.get("id", 1) - 1], **obj} for obj in data
+            ]
+            return json.dumps(objects).encode()
+        return json.dumps({**self.devices[data.get("id", 1) - 1], **data}).encode()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = request.url.path
+        if path == f"{API}/docs/":
+            content = self.spec
+        elif path == f"{API}/status/":
+            content = b'{"netbox-version": "3.2.0"}'
+        elif path == f"{API}/dcim/devices/" and request.method == "GET":
+            content = self.page(request)
+        elif path.startswith(f"{API}/dcim/devices/") and request.method == "GET":
+            index = int(path.rstrip("/").rsplit("/", 1)[1]) - 1
+            content = json.dumps(self.devices[index]).encode()
+        elif path.startswith(f"{API}/dcim/devices/"):
+            content = self.write(request)
+        else:
+            return httpx.Response(404, json={"detail": "Not found."})
+        return httpx.Response(
+            200, content=content, headers={"content-type": "application/json"}
+        )
@@ -0,0 +1,44 @@
+import pytest
+
+from anac import api
+from benchmarks.netbox import MockNetBox
+
+
+@pytest.fixture(scope="module")
+def netbox():
+    return MockNetBox(count=10, paths=600)
+
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_openapi_startup(benchmark, run, netbox, lazy):
+    async def startup():
+        a = api(
+            "https://netbox.local",
+            token="benchmark",
+            lazy=lazy,
+            transport=netbox.transport(),
+        )
+        await a.openapi()
+        await a.aclose()
+        return a
+
+    a = benchmark.pedantic(run, args=(startup,), rounds=20)
+
+    assert len(a.endpoints) == 1200
+
+
+def test_openapi_startup_cached(benchmark, run, netbox, tmp_path):
+    async def startup():
+        async with api(
+            "https://netbox.local",
+            token="benchmark",
+            cache_dir=tmp_path,
+            lazy=True,
+            transport=netbox.transport(),
+        ) as a:
+            return a
+
+    run(startup)
+    a = benchmark.pedantic(run, args=(startup,), rounds=20)
+
+    assert len(a.endpoints) == 1200
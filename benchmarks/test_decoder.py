@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from anac.core.decoder import get_loads
+from benchmarks.data import devices
+
+
+@pytest.fixture(scope="module")
+def page():
+    results = devices(1000)
+    return json.dumps(
+        {"count": 1000, "next": None, "previous": None, "results": results}
+    ).encode()
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_decode_page(benchmark, page, name):
+    if name != "json":
+        pytest.importorskip(name)
+    loads = get_loads(name)
+
+    data = benchmark(loads, page)
+
+    assert len(data["results"]) == 1000
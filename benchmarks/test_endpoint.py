@@ -0,0 +1,127 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from anac import api
+from anac.core.endpoint import Endpoint
+from benchmarks.netbox import MockNetBox
+
+
+def netbox_api(netbox):
+    a = api("https://netbox.local", token="benchmark", transport=netbox.transport())
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+    return a
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.01], ids=["0ms", "10ms"])
+@pytest.mark.parametrize("count", [1_000, 10_000])
+def test_get_all(benchmark, run, throughput, count, latency):
+    netbox = MockNetBox(count=count, latency=latency)
+
+    async def get_all():
+        a = netbox_api(netbox)
+        devices = await a.dcim_devices.get_all(limit=1000, concurrency=8)
+        await a.aclose()
+        return devices
+
+    devices = benchmark.pedantic(run, args=(get_all,), rounds=5)
+
+    assert len(devices) == count
+    throughput("objects_per_second", count)
+
+
+@pytest.mark.parametrize("count", [10_000])
+def test_stream(benchmark, run, throughput, count):
+    netbox = MockNetBox(count=count)
+
+    async def stream():
+        a = netbox_api(netbox)
+        names = [d.name async for d in a.dcim_devices.stream(limit=1000, prefetch=2)]
+        await a.aclose()
+        return names
+
+    names = benchmark.pedantic(run, args=(stream,), rounds=5)
+
+    assert len(names) == count
+    throughput("objects_per_second", count)
+
+
+@pytest.mark.parametrize("method", ["stream", "stream_raw"])
+def test_stream_raw(benchmark, run, throughput, method):
+    count = 10_000
+    netbox = MockNetBox(count=count)
+
+    async def stream():
+        a = netbox_api(netbox)
+        if method == "stream":
+            rows = [d async for d in a.dcim_devices.stream(limit=1000, raw=True)]
+        else:
+            rows = [d async for d in a.dcim_devices.stream_raw(limit=1000)]
+        await a.aclose()
+        return rows
+
+    rows = benchmark.pedantic(run, args=(stream,), rounds=5)
+
+    assert len(rows) == count
+    throughput("objects_per_second", count)
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.01], ids=["0ms", "10ms"])
+def test_get_endpoint_id(benchmark, run, throughput, latency):
+    count = 200
+    netbox = MockNetBox(count=count, latency=latency)
+
+    async def get_many():
+        a = netbox_api(netbox)
+        pending = await a.dcim_devices(get=[{"id": i} for i in range(1, count + 1)])
+        devices = await pending.run(concurrency=32)
+        await a.aclose()
+        return devices
+
+    devices = benchmark.pedantic(run, args=(get_many,), rounds=5)
+
+    assert len(devices) == count
+    throughput("requests_per_second", count)
+
+
+@pytest.mark.parametrize("latency", [0.0, 0.01], ids=["0ms", "10ms"])
+def test_bulk_patch(benchmark, run, throughput, latency):
+    count = 5_000
+    netbox = MockNetBox(count=count, latency=latency)
+    patches = [{"id": i, "serial": f"SN{i}"} for i in range(1, count + 1)]
+
+    async def bulk():
+        a = netbox_api(netbox)
+        devices = await a.dcim_devices.bulk(
+            patch=patches, chunk_size=500, concurrency=4
+        )
+        await a.aclose()
+        return devices
+
+    devices = benchmark.pedantic(run, args=(bulk,), rounds=5)
+
+    assert len(devices) == count
+    throughput("objects_per_second", count)
+
+
+def test_get_all_memory(benchmark, run):
+    count = 100_000
+    netbox = MockNetBox(count=count)
+    a = netbox_api(netbox)
+    # serialize the pages before the measurement
+    run(a.dcim_devices.get_all)
+
+    def get_all():
+        gc.collect()
+        tracemalloc.start()
+        devices = run(a.dcim_devices.get_all)
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return devices, size, peak
+
+    devices, size, peak = benchmark.pedantic(get_all, rounds=1)
+
+    assert len(devices) == count
+    benchmark.extra_info["bytes_per_object"] = size / count
+    benchmark.extra_info["peak_bytes_per_object"] = peak / count
@@ -0,0 +1,58 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from anac import api
+from anac.core.endpoint import EndpointId
+from benchmarks.data import devices
+
+COUNT = 100_000
+
+
+@pytest.fixture(scope="module")
+def anac_api():
+    return api("https://netbox.local", token="benchmark")
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return devices(COUNT)
+
+
+def build(anac_api, rows):
+    return [
+        EndpointId(
+            api=anac_api, url=anac_api.base_url, endpoint="/dcim/devices/", kwargs=row
+        )
+        for row in rows
+    ]
+
+
+def test_endpoint_id_construction(benchmark, anac_api, rows):
+    objects = benchmark.pedantic(build, args=(anac_api, rows), rounds=5)
+
+    assert len(objects) == COUNT
+
+
+def test_endpoint_id_attribute_access(benchmark, anac_api, rows):
+    objects = build(anac_api, rows)
+
+    def access():
+        for obj in objects:
+            obj.name
+            obj.site.slug
+            obj.device_type.manufacturer.name
+
+    benchmark.pedantic(access, rounds=5)
+
+
+def test_endpoint_id_memory(benchmark, anac_api, rows):
+    gc.collect()
+    tracemalloc.start()
+    objects = benchmark.pedantic(build, args=(anac_api, rows), rounds=1)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    benchmark.extra_info["bytes_per_object"] = size / len(objects)
+    assert size / len(objects) < 1024
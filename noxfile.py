@@ -5,7 +5,7 @@ import nox
 from nox.sessions import Session
 
 
-locations = "anac", "tests", "noxfile.py"
+locations = "anac", "tests", "benchmarks", "noxfile.py"
 
 
 def install_with_constraints(session: Session, *args: str, **kwargs: Any) -> None:
@@ -51,6 +51,15 @@ def unit_tests(session: Session) -> None:
     session.run("pytest", *args)
 
 
+@nox.session(python="3.10")
+def benchmarks(session: Session) -> None:
+    args = session.posargs or ["benchmarks"]
+    session.run("poetry", "install", "--no-dev", external=True)
+    install_with_constraints(session, "pytest", "pytest-asyncio")
+    session.install("pytest-benchmark", "orjson", "msgspec")
+    session.run("pytest", *args)
+
+
 @nox.session(python=["3.8", "3.9", "3.10"])
 def mypy(session: Session) -> None:
     args = session.posargs or locations
@@ -4,7 +4,13 @@ import pickle
 import re
 from unittest.mock import AsyncMock
 
-from httpx import ConnectError, HTTPStatusError
+from httpx import (
+    AsyncClient,
+    ConnectError,
+    HTTPStatusError,
+    MockTransport,
+    Response,
+)
 import pytest
 
 from anac import api
@@ -157,3 +163,112 @@ async def test_anac_api_exceptions(
             raise ConnectError("[Errno -2] Name or service not known")
         a = api(**kwargs)
         await a.openapi(timeout=1.0)
+
+
+@pytest.fixture
+def netbox_spec(openapi_spec):
+    state = {"version": "3.2.3", "requests": []}
+
+    def handler(request):
+        state["requests"].append(request)
+        if request.url.path == "/api/status/":
+            if state["version"] is None:
+                return Response(404, json={"detail": "Not found."})
+            return Response(200, json={"netbox-version": state["version"]})
+        if request.headers.get("if-none-match") == '"spec"':
+            return Response(304)
+        return Response(200, json=openapi_spec, headers={"ETag": '"spec"'})
+
+    state["handler"] = handler
+    return state
+
+
+def spec_api(netbox_spec, cache_dir):
+    a = api("https://demo.netbox.dev", token="test_token", cache_dir=cache_dir)
+    a.http_session = AsyncClient(transport=MockTransport(netbox_spec["handler"]))
+    return a
+
+
+def spec_requests(netbox_spec):
+    return [r.url.path for r in netbox_spec["requests"] if r.url.path != "/api/status/"]
+
+
+@pytest.mark.asyncio
+async def test_openapi_cache(netbox_spec, openapi_spec, tmp_path):
+    await spec_api(netbox_spec, tmp_path).openapi()
+    assert spec_requests(netbox_spec) == ["/api/docs/"]
+    assert len(list(tmp_path.iterdir())) == 1
+
+    a = spec_api(netbox_spec, tmp_path)
+    await a.openapi()
+    assert spec_requests(netbox_spec) == ["/api/docs/"]
+    assert a.open_api == openapi_spec
+    assert isinstance(a.circuits_circuit_terminations, Endpoint)
+
+    netbox_spec["version"] = "3.2.4"
+    await spec_api(netbox_spec, tmp_path).openapi()
+    assert spec_requests(netbox_spec) == ["/api/docs/", "/api/docs/"]
+
+
+@pytest.mark.asyncio
+async def test_openapi_cache_revalidation(netbox_spec, openapi_spec, tmp_path):
+    netbox_spec["version"] = None
+    await spec_api(netbox_spec, tmp_path).openapi()
+
+    a = spec_api(netbox_spec, tmp_path)
+    await a.openapi()
+    assert netbox_spec["requests"][-1].headers["if-none-match"] == '"spec"'
+    assert a.open_api == openapi_spec
+
+
+@pytest.mark.asyncio
+async def test_openapi_lazy(mock_get_openapi):
+    a = api("https://demo.netbox.dev", token="test_token", lazy=True)
+    await a.openapi()
+
+    assert a.endpoints == {
+        "circuits_circuit_terminations": "/circuits/circuit-terminations/"
+    }
+    assert "circuits_circuit_terminations" not in a.__dict__
+    assert "open_api" not in a.__dict__
+    assert a.spec_version == "3.2"
+    assert "circuits_circuit_terminations" in dir(a)
+
+    endpoint = a.circuits_circuit_terminations
+    assert isinstance(endpoint, Endpoint)
+    assert endpoint.endpoint == "/circuits/circuit-terminations/"
+    assert a.circuits_circuit_terminations is endpoint
+
+    with pytest.raises(AttributeError):
+        a.dcim_devices
+
+
+@pytest.mark.asyncio
+async def test_transport(openapi_spec):
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=MockTransport(lambda request: Response(200, json=openapi_spec)),
+        connect_timeout=1.0,
+        read_timeout=30.0,
+    )
+    await a.openapi()
+
+    assert a.open_api == openapi_spec
+    assert a.http_session.timeout.connect == 1.0
+    assert a.http_session.timeout.read == 30.0
+
+    await a.aclose()
+    assert a.http_session.is_closed
+
+
+@pytest.mark.asyncio
+async def test_client(openapi_spec):
+    client = AsyncClient(
+        transport=MockTransport(lambda request: Response(200, json=openapi_spec))
+    )
+    async with api("https://demo.netbox.dev", token="test_token", client=client) as a:
+        assert a.http_session is client
+
+    assert a.open_api == openapi_spec
+    assert not client.is_closed
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from anac import blocking_api
+from anac.core.blocking import BlockingEndpoint
+from anac.core.endpoint import EndpointId, EndpointIdIterator
+from tests.unit.test_endpoint import DEVICES, paginate
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def a(requests):
+    def handler(request):
+        requests.append(request)
+        if request.url.path == "/api/docs/":
+            return httpx.Response(200, json={"paths": {"/dcim/devices/": {}}})
+        return paginate(request, DEVICES)
+
+    a = blocking_api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+    )
+    yield a
+    a.close()
+
+
+def test_blocking_api(a, requests):
+    devices = a.dcim_devices(get={})
+    all_devices = a.dcim_devices.get_all(limit=10)
+    streamed = [d.id for d in a.dcim_devices.stream(limit=10)]
+    device = a.dcim_devices.only("name")(get={"limit": 1})
+
+    assert isinstance(a.dcim_devices, BlockingEndpoint)
+    assert isinstance(devices, EndpointIdIterator)
+    assert len(all_devices) == len(DEVICES)
+    assert streamed == [d["id"] for d in DEVICES]
+    assert isinstance(device, EndpointId)
+    assert {*device.kwargs} == {"id", "name", "response"}
+    assert [r.url.path for r in requests].count("/api/docs/") == 1
+
+
+def test_blocking_api_threads(a):
+    with ThreadPoolExecutor(8) as pool:
+        results = [*pool.map(lambda _: len(a.dcim_devices.get_all()), range(16))]
+
+    assert results == [len(DEVICES)] * 16
+
+
+def test_blocking_api_stream_close(a):
+    for device in a.dcim_devices.stream(limit=10):
+        if device.id == 3:
+            break
+
+    assert a.dcim_devices.get_all().response.status_code == 200
+
+
+def test_blocking_api_close(a):
+    a.close()
+    a.close()
+
+    assert not a.thread.is_alive()
+    with pytest.raises(RuntimeError):
+        a.dcim_devices(get={})
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from anac import api, ResponseCache
+from anac.core.cache import request_key
+from anac.core.endpoint import Endpoint
+
+
+@pytest.fixture
+def monotonic(mocker):
+    return mocker.patch("anac.core.cache.time.monotonic", return_value=100.0)
+
+
+def test_request_key():
+    assert request_key("/dcim/devices/", {"b": [1, 2], "a": {"id": 1}}) == request_key(
+        "/dcim/devices/", {"a": {"id": 1}, "b": [1, 2]}
+    )
+    assert request_key("/dcim/devices/{id}/", {"id": 1})[0] == "/dcim/devices/"
+
+
+def test_response_cache(monotonic):
+    cache = ResponseCache(ttl=10, maxsize=2)
+    keys = [request_key("/dcim/sites/", {"slug": slug}) for slug in "abc"]
+
+    assert cache.get(keys[0]) is None
+    cache.set(keys[0], "a")
+    cache.set(keys[1], "b")
+    assert cache.get(keys[0]) == "a"
+    cache.set(keys[2], "c")
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
+
+    monotonic.return_value = 111.0
+    assert cache.get(keys[0]) is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+
+
+def test_response_cache_invalidate(monotonic):
+    cache = ResponseCache()
+    site = request_key("/dcim/sites/{id}/", {"id": 1})
+    device = request_key("/dcim/devices/", {})
+    generation = cache.generation(site)
+    cache.set(site, "site")
+    cache.set(device, "device")
+
+    cache.invalidate("/dcim/sites/")
+    assert cache.get(site) is None
+    assert cache.get(device) == "device"
+    assert cache.invalidations == 1
+
+    cache.set(site, "site", generation)
+    assert cache.get(site) is None
+
+
+@pytest.fixture
+def cached_api():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": 1, "name": f"site{len(requests)}"})
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        cache=ResponseCache(),
+    )
+    a.dcim_sites = Endpoint(a, a.base_url, "/dcim/sites/")
+    a.requests = requests
+    return a
+
+
+@pytest.mark.asyncio
+async def test_cached_request(cached_api):
+    site1 = await cached_api.dcim_sites(get={"slug": "site"})
+    site2 = await cached_api.dcim_sites(get={"slug": "site"})
+
+    assert len(cached_api.requests) == 1
+    assert site1 is not site2
+    assert site1.name == site2.name == "site1"
+    assert (cached_api.cache.hits, cached_api.cache.misses) == (1, 1)
+
+    await site1(patch={"name": "test"})
+    site3 = await cached_api.dcim_sites(get={"slug": "site"})
+
+    assert len(cached_api.requests) == 3
+    assert site3.name == "site3"
+
+
+@pytest.fixture
+def coalesced_api():
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        if request.url.params["id"] == "0":
+            return httpx.Response(404, json={"detail": "Not found."})
+        return httpx.Response(200, json={"id": int(request.url.params["id"])})
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        coalesce=True,
+    )
+    a.dcim_device_types = Endpoint(a, a.base_url, "/dcim/device-types/")
+    a.requests = requests
+    return a
+
+
+@pytest.mark.asyncio
+async def test_coalesced_request(coalesced_api):
+    pending = await coalesced_api.dcim_device_types(get=[{"id": 7}] * 50 + [{"id": 8}])
+    results = await asyncio.gather(*pending)
+
+    assert len(coalesced_api.requests) == 2
+    assert len({id(r) for r in results}) == 51
+    assert [r.id for r in results] == [7] * 50 + [8]
+    assert coalesced_api.in_flight == {}
+
+    await coalesced_api.dcim_device_types(get={"id": 7})
+    assert len(coalesced_api.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesced_request_exception(coalesced_api):
+    pending = await coalesced_api.dcim_device_types(get=[{"id": 0}] * 3)
+    results = await pending.run()
+
+    assert len(coalesced_api.requests) == 1
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
@@ -0,0 +1,21 @@
+from json import JSONDecodeError
+
+import pytest
+
+from anac.core.decoder import get_loads
+
+
+@pytest.mark.parametrize("name", [None, "orjson", "msgspec", "json"])
+def test_get_loads(name):
+    if name in ("orjson", "msgspec"):
+        pytest.importorskip(name)
+    loads = get_loads(name)
+
+    assert loads(b'{"results": [{"id": 1}]}') == {"results": [{"id": 1}]}
+    with pytest.raises(JSONDecodeError):
+        loads(b"test123")
+
+
+def test_get_loads_unknown():
+    with pytest.raises(ValueError):
+        get_loads("simplejson")
@@ -0,0 +1,662 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from anac import api, BulkError, Metrics, RequestDataError, ResponseCache
+from anac.core.endpoint import Endpoint, EndpointId, EndpointIdIterator
+
+
+DEVICES = [{"id": i, "name": f"device{i}"} for i in range(1, 26)]
+
+
+def paginate(request, objects):
+    limit = int(request.url.params.get("limit", 10)) or len(objects)
+    offset = int(request.url.params.get("offset", 0))
+    page = objects[offset : offset + limit]
+    next_ = None
+    if offset + limit < len(objects):
+        next_ = str(request.url.copy_merge_params({"offset": offset + limit}))
+    return httpx.Response(
+        200,
+        json={
+            "count": len(objects),
+            "next": next_,
+            "previous": None,
+            "results": page,
+        },
+    )
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def netbox(requests):
+    def handler(request):
+        requests.append(request)
+        return paginate(request, DEVICES)
+
+    return handler
+
+
+@pytest.fixture
+def anac_api(netbox):
+    a = api("https://demo.netbox.dev", token="test_token")
+    a.http_session = httpx.AsyncClient(transport=httpx.MockTransport(netbox))
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+    return a
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 7, 10, 25, 1000])
+async def test_get_all(anac_api, requests, limit):
+    devices = await anac_api.dcim_devices.get_all(limit=limit, concurrency=3)
+
+    assert isinstance(devices, EndpointIdIterator)
+    assert [d.id for d in devices] == [d["id"] for d in DEVICES]
+    assert len(requests) == -(-len(DEVICES) // limit)
+
+
+@pytest.mark.asyncio
+async def test_get_all_params(anac_api, requests):
+    await anac_api.dcim_devices.get_all(get={"site": "test"}, limit=10)
+
+    assert all(r.url.params["site"] == "test" for r in requests)
+    assert sorted(int(r.url.params["offset"]) for r in requests) == [0, 10, 20]
+
+
+@pytest.mark.asyncio
+async def test_get_all_single_result(anac_api):
+    anac_api.http_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: paginate(r, DEVICES[:1]))
+    )
+    device = await anac_api.dcim_devices.get_all()
+
+    assert isinstance(device, EndpointId)
+    assert device.name == "device1"
+    assert json.loads(device.response.content)["count"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+async def test_stream(anac_api, requests, prefetch):
+    devices = [
+        device
+        async for device in anac_api.dcim_devices.stream(limit=10, prefetch=prefetch)
+    ]
+
+    assert all(isinstance(device, EndpointId) for device in devices)
+    assert [d.id for d in devices] == [d["id"] for d in DEVICES]
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data", [DEVICES[0], DEVICES[:2]])
+async def test_stream_not_paginated(anac_api, data):
+    anac_api.http_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, json=data))
+    )
+    devices = [d async for d in anac_api.dcim_devices.stream(raw=True)]
+
+    assert devices == (data if isinstance(data, list) else [data])
+
+
+@pytest.mark.asyncio
+async def test_stream_prefetch(anac_api, requests):
+    stream = anac_api.dcim_devices.stream(limit=5, prefetch=2)
+    device = await stream.__anext__()
+    await asyncio.sleep(0)
+
+    assert device.id == 1
+    # the first page and 2 prefetched pages
+    assert len(requests) == 3
+
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_all_raw(anac_api, requests):
+    devices = await anac_api.dcim_devices.get_all(limit=10, raw=True)
+
+    assert devices == DEVICES
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_raw_mode(anac_api):
+    devices = [d async for d in anac_api.dcim_devices.stream(limit=10, raw=True)]
+
+    assert devices == DEVICES
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 7, 25, 1000])
+async def test_stream_raw(anac_api, requests, limit):
+    devices = [d async for d in anac_api.dcim_devices.stream_raw(limit=limit)]
+
+    assert devices == DEVICES
+    assert len(requests) == -(-len(DEVICES) // limit)
+    assert [int(r.url.params["offset"]) for r in requests] == [
+        *range(0, len(DEVICES), limit)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_raw_hooks(anac_api, requests):
+    metrics = Metrics()
+    anac_api.hooks = [metrics]
+
+    devices = [d async for d in anac_api.dcim_devices.stream_raw(limit=10)]
+
+    assert devices == DEVICES
+    stats = metrics.summary()["/dcim/devices/"]
+    assert stats["count"] == len(requests) == 3
+    assert stats["decode_time"] == 0.0
+    assert stats["bytes_in"] > 0
+    assert stats["bytes_in"] == sum(len(paginate(r, DEVICES).content) for r in requests)
+
+
+@pytest.mark.asyncio
+async def test_stream_raw_projection(anac_api, requests):
+    devices = [d async for d in anac_api.dcim_devices.only("name").stream_raw()]
+
+    assert devices == [{"id": d["id"], "name": d["name"]} for d in DEVICES]
+    assert requests[0].url.params["exclude"] == "config_context"
+
+
+@pytest.mark.asyncio
+async def test_stream_raw_exceptions(anac_api):
+    anac_api.http_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda r: httpx.Response(400, json={"limit": ["invalid"]})
+        )
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        [d async for d in anac_api.dcim_devices.stream_raw()]
+
+
+@pytest.mark.asyncio
+async def test_single_decode(anac_api, mocker):
+    loads = mocker.spy(anac_api, "loads")
+    devices = await anac_api.dcim_devices.get_all(limit=10)
+
+    assert len(devices) == len(DEVICES)
+    assert loads.call_count == 3
+
+
+def test_endpoint_id_attributes(anac_api):
+    data = {
+        "id": 1,
+        "name": "device1",
+        "site": {"id": 2, "slug": "site2", "region": {"id": 3}},
+        "custom_fields": {"Support Contract": "gold", "items": 5, "get": "x"},
+        "tags": [{"id": 4}],
+        "url": "https://demo.netbox.dev/api/dcim/devices/1/",
+    }
+    device = EndpointId(
+        api=anac_api, url=anac_api.base_url, endpoint="/dcim/devices/", kwargs=data
+    )
+
+    assert device.id == 1
+    assert device.site == {"id": 2, "slug": "site2", "region": {"id": 3}}
+    assert isinstance(device.site, dict)
+    assert device.site.region.id == 3
+    assert device.site is device.site
+    assert device.custom_fields.support_contract == "gold"
+    assert device.custom_fields.items == 5
+    assert device.custom_fields.get == "x"
+    assert device.site.items() == data["site"].items()
+    assert device.url == data["url"]
+    assert device.endpoint == "/dcim/devices/"
+    assert device.tags == [{"id": 4}]
+    assert device.tags[0].id == 4
+    assert device.tags is device.tags
+    assert {"id", "name", "site", "custom_fields"} <= set(dir(device))
+    assert "support_contract" in dir(device.custom_fields)
+    assert vars(device) is data
+
+    device.name = "device2"
+    device.support_level = 3
+    device.url = "https://demo.netbox.dev/api/dcim/devices/2/"
+    assert device.name == data["name"] == "device2"
+    assert device.support_level == data["support_level"] == 3
+    assert device.url == data["url"] == "https://demo.netbox.dev/api/dcim/devices/2/"
+    assert device._url == anac_api.base_url
+
+    with pytest.raises(AttributeError):
+        device.status
+    with pytest.raises(AttributeError):
+        device.site.status
+
+
+@pytest.fixture
+def bulk_netbox(anac_api, requests):
+    def handler(request):
+        requests.append(request)
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        objects = json.loads(request.content)
+        if request.method == "POST":
+            objects = [{"id": 100 + i, **obj} for i, obj in enumerate(objects)]
+        return httpx.Response(200, json=objects)
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return anac_api
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch(bulk_netbox, requests):
+    objects = [{"id": i, "enabled": False} for i in range(1, 26)]
+    interfaces = await bulk_netbox.dcim_devices.bulk(patch=objects, chunk_size=10)
+
+    assert [i.id for i in interfaces] == list(range(1, 26))
+    assert all(i.enabled is False for i in interfaces)
+    assert [len(json.loads(r.content)) for r in requests] == [10, 10, 5]
+    assert all(r.url.path == "/api/dcim/devices/" for r in requests)
+    assert all(r.method == "PATCH" for r in requests)
+
+
+@pytest.mark.asyncio
+async def test_bulk_post(bulk_netbox):
+    devices = await bulk_netbox.dcim_devices.bulk(
+        post=[{"name": "test1"}, {"name": "test2"}]
+    )
+
+    assert [(d.id, d.name) for d in devices] == [(100, "test1"), (101, "test2")]
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete(bulk_netbox, requests):
+    devices = await bulk_netbox.dcim_devices.bulk(
+        delete=[{"id": 1}, {"id": 2}, {"id": 3}], chunk_size=2
+    )
+
+    assert len(devices) == 0
+    assert [json.loads(r.content) for r in requests] == [
+        [{"id": 1}, {"id": 2}],
+        [{"id": 3}],
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("kwargs", "exc"),
+    [
+        ({"patch": [{"name": "test"}]}, RequestDataError),
+        ({"delete": []}, RequestDataError),
+        ({"get": [{"id": 1}]}, ValueError),
+        ({"patch": [{"id": 1}], "delete": [{"id": 1}]}, ValueError),
+    ],
+)
+async def test_bulk_exceptions(bulk_netbox, kwargs, exc):
+    with pytest.raises(exc):
+        await bulk_netbox.dcim_devices.bulk(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_bulk_chunk_error(anac_api, requests):
+    def handler(request):
+        requests.append(request)
+        objects = json.loads(request.content)
+        if objects[0]["id"] == 11:
+            return httpx.Response(400, json={"enabled": ["invalid"]})
+        return httpx.Response(200, json=objects)
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    objects = [{"id": i, "enabled": False} for i in range(1, 26)]
+
+    with pytest.raises(BulkError) as e:
+        await anac_api.dcim_devices.bulk(patch=objects, chunk_size=10, concurrency=1)
+
+    assert len(requests) == 3
+    assert e.value.method == "patch"
+    assert [(chunk, type(exc)) for chunk, exc in e.value.errors] == [
+        (objects[10:20], httpx.HTTPStatusError)
+    ]
+    assert e.value.succeeded == e.value.results == objects[:10] + objects[20:]
+    assert isinstance(e.value.__cause__, httpx.HTTPStatusError)
+
+
+@pytest.fixture
+def slow_netbox(anac_api):
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        name = request.url.params["name"]
+        await asyncio.sleep(0.01 if name != "device1" else 0.05)
+        state["in_flight"] -= 1
+        if name == "missing":
+            return httpx.Response(404, json={"detail": "Not found."})
+        return paginate(request, [d for d in DEVICES if d["name"] == name])
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return state
+
+
+@pytest.mark.asyncio
+async def test_endpoint_as_iterator_run(anac_api, slow_netbox):
+    names = ["device1", "missing", *(f"device{i}" for i in range(2, 20))]
+    pending = await anac_api.dcim_devices(get=[{"name": name} for name in names])
+    results = await pending.run(concurrency=4)
+
+    assert slow_netbox["max_in_flight"] == 4
+    assert results[0].name == "device1"
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert [r.name for r in results[2:]] == names[2:]
+
+
+@pytest.mark.asyncio
+async def test_endpoint_as_iterator_as_completed(anac_api, slow_netbox):
+    names = ["device1", "missing", "device2"]
+    pending = await anac_api.dcim_devices(get=[{"name": name} for name in names])
+    results = [item async for item in pending.as_completed(concurrency=2)]
+
+    assert slow_netbox["max_in_flight"] == 2
+    assert [index for index, _ in results] == [1, 2, 0]
+    assert isinstance(results[0][1], httpx.HTTPStatusError)
+    assert results[1][1].name == "device2"
+
+
+@pytest.fixture
+def filter_netbox(anac_api, requests):
+    def handler(request):
+        requests.append(request)
+        ids = request.url.params.get_list("id")
+        names = request.url.params.get_list("name")
+        objects = [d for d in DEVICES if str(d["id"]) in ids or d["name"] in names]
+        if "fields" in request.url.params:
+            fields = request.url.params["fields"].split(",")
+            objects = [{k: d[k] for k in fields if k in d} for d in objects]
+        return paginate(request, objects)
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return anac_api
+
+
+@pytest.mark.asyncio
+async def test_lookup(filter_netbox, requests):
+    values = [*range(1, 26), 100, 1]
+    devices = await filter_netbox.dcim_devices.lookup(values, max_url_length=150)
+
+    assert [*devices] == [*range(1, 26)]
+    assert all(devices[i].name == f"device{i}" for i in devices)
+    assert 1 < len(requests) < 25
+    assert all(len(str(r.url)) <= 150 for r in requests)
+    assert sorted(int(i) for r in requests for i in r.url.params.get_list("id")) == [
+        *range(1, 26),
+        100,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_lookup_projection(filter_netbox, requests):
+    endpoint = filter_netbox.dcim_devices.only("id", "name")
+    devices = await endpoint.lookup([*range(1, 26)], max_url_length=150)
+
+    assert [*devices] == [*range(1, 26)]
+    assert all(r.url.params["exclude"] == "config_context" for r in requests)
+    assert all(len(str(r.url)) <= 150 for r in requests)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fields, brief, projection",
+    [
+        (("id",), False, {"fields": "id,name"}),
+        (("name",), False, {"fields": "id,name"}),
+        ((), True, {"brief": "1"}),
+    ],
+)
+async def test_lookup_projection_fields(
+    filter_netbox, requests, fields, brief, projection
+):
+    filter_netbox.spec_version = "4.0.3 (4.0)"
+    endpoint = filter_netbox.dcim_devices.only(*fields, brief=brief)
+    devices = await endpoint.lookup(["device2", "device3"], key="name")
+
+    assert {name: d.id for name, d in devices.items()} == {"device2": 2, "device3": 3}
+    assert all(projection.items() <= r.url.params.items() for r in requests)
+
+
+@pytest.mark.asyncio
+async def test_lookup_projection_brief(filter_netbox, requests):
+    filter_netbox.spec_version = "4.0.3 (4.0)"
+    endpoint = filter_netbox.dcim_devices.only(brief=True)
+    devices = await endpoint.lookup(["device2"], key="label")
+
+    assert devices == {}
+    assert "brief" not in requests[0].url.params
+
+
+@pytest.mark.asyncio
+async def test_lookup_names(filter_netbox, requests):
+    devices = await filter_netbox.dcim_devices.lookup(
+        ["device2", "device3", "missing"], key="name"
+    )
+
+    assert {name: d.id for name, d in devices.items()} == {"device2": 2, "device3": 3}
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_exceptions(filter_netbox):
+    with pytest.raises(ValueError):
+        await filter_netbox.dcim_devices.lookup(
+            ["x" * 200], key="name", max_url_length=100
+        )
+
+
+@pytest.fixture
+def prefetch_api(anac_api, requests):
+    base_url = anac_api.base_url
+    sites = [{"id": i, "slug": f"site{i}"} for i in range(1, 4)]
+    tags = [{"id": i, "name": f"tag{i}"} for i in range(1, 3)]
+    devices = [
+        {
+            "id": i,
+            "site": {"id": i % 4, "url": f"{base_url}/dcim/sites/{i % 4}/"},
+            "tags": [{"id": 1, "url": f"{base_url}/extras/tags/1/"}],
+            "tenant": None,
+        }
+        for i in range(1, 21)
+    ]
+
+    def handler(request):
+        requests.append(request)
+        path = request.url.path
+        objects = {"/api/dcim/sites/": sites, "/api/extras/tags/": tags}.get(path)
+        if objects is None:
+            return paginate(request, devices)
+        ids = request.url.params.get_list("id")
+        return paginate(request, [o for o in objects if str(o["id"]) in ids])
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return anac_api
+
+
+@pytest.mark.asyncio
+async def test_get_all_prefetch(prefetch_api, requests):
+    result = await prefetch_api.dcim_devices.get_all(
+        limit=10, prefetch=["site", "tags", "tenant"]
+    )
+
+    assert [r.url.path for r in requests].count("/api/dcim/sites/") == 1
+    assert [r.url.path for r in requests].count("/api/extras/tags/") == 1
+    assert result[0].site.slug == "site1"
+    assert result[0].site.endpoint == "/dcim/sites/"
+    assert result[0].tags[0].name == "tag1"
+    assert result[0].tenant is None
+    # NetBox object is not found, the reference is kept
+    assert result[3].site.id == 0
+    assert not isinstance(result[3].site, EndpointId)
+
+
+@pytest.mark.asyncio
+async def test_get_all_prefetch_raw(prefetch_api):
+    base_url = prefetch_api.base_url
+    result = await prefetch_api.dcim_devices.get_all(
+        limit=10, prefetch=["site", "tags"], raw=True
+    )
+
+    assert result[0]["site"] == {"id": 1, "slug": "site1"}
+    assert result[0]["tags"] == [{"id": 1, "name": "tag1"}]
+    assert result[3]["site"] == {"id": 0, "url": f"{base_url}/dcim/sites/0/"}
+    assert all(type(row["site"]) is dict for row in result)
+
+
+FULL_DEVICES = [
+    {"id": i, "name": f"device{i}", "status": "active", "config_context": {"a": i}}
+    for i in range(1, 26)
+]
+
+
+@pytest.fixture
+def projection_netbox(anac_api, requests):
+    def handler(request):
+        requests.append(request)
+        fields = request.url.params.get("fields")
+        objects = FULL_DEVICES
+        if fields:
+            objects = [{k: d[k] for k in fields.split(",")} for d in objects]
+        elif request.url.params.get("brief"):
+            objects = [{"id": d["id"], "name": d["name"]} for d in objects]
+        return paginate(request, objects)
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return anac_api
+
+
+@pytest.mark.asyncio
+async def test_only_client_side(projection_netbox, requests):
+    devices = projection_netbox.dcim_devices.only("name")
+
+    all_devices = await devices.get_all(limit=10)
+    device = await devices(get={"name": "device1", "limit": 1})
+    streamed = [d async for d in devices.stream(limit=10)]
+
+    expected = [{"id": d["id"], "name": d["name"]} for d in FULL_DEVICES]
+    assert [d.kwargs for d in all_devices] == expected
+    assert [d.kwargs for d in streamed] == expected
+    assert {*device.kwargs} == {"id", "name", "response"}
+    assert all(r.url.params["exclude"] == "config_context" for r in requests)
+    # the projection does not change the original Endpoint
+    assert projection_netbox.dcim_devices.fields is None
+    assert (
+        "config_context" in (await projection_netbox.dcim_devices.get_all())[0].kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_server_side(projection_netbox, requests):
+    projection_netbox.spec_version = "4.0.3 (4.0)"
+
+    all_devices = await projection_netbox.dcim_devices.only("status").get_all()
+
+    assert all_devices[0].kwargs == {"id": 1, "status": "active"}
+    assert requests[0].url.params["fields"] == "id,status"
+    assert "exclude" not in requests[0].url.params
+
+
+@pytest.mark.asyncio
+async def test_only_brief(projection_netbox, requests):
+    all_devices = await projection_netbox.dcim_devices.only(brief=True).get_all()
+
+    assert all_devices[0].kwargs == {"id": 1, "name": "device1"}
+    assert requests[0].url.params["brief"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_only_cache(projection_netbox, requests):
+    projection_netbox.spec_version = "4.1.0 (4.1)"
+    projection_netbox.cache = ResponseCache()
+
+    names = await projection_netbox.dcim_devices.only("name")(get={})
+    devices = await projection_netbox.dcim_devices(get={})
+
+    assert len(requests) == 2
+    assert "config_context" not in names[0].kwargs
+    assert "config_context" in devices[0].kwargs
+
+
+@pytest.fixture
+def device_netbox(anac_api, requests):
+    in_flight = [0, 0]
+
+    async def handler(request):
+        requests.append(request)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        data = {"id": 1, "name": "device1"}
+        if request.method != "GET":
+            data.update(json.loads(request.content))
+        return httpx.Response(200, json=data)
+
+    anac_api.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    anac_api.max_in_flight = in_flight
+    return anac_api
+
+
+@pytest.mark.asyncio
+async def test_endpoint_id_serial(device_netbox, requests):
+    device = EndpointId(
+        device_netbox, device_netbox.base_url, "/dcim/devices/", {"id": 1}
+    )
+
+    results = await device(get={}, patch=[{"name": "a"}, {"serial": "1"}])
+
+    assert [r.method for r in requests] == ["GET", "PATCH", "PATCH"]
+    assert [r.name for r in results] == ["device1", "a", "device1"]
+    assert device_netbox.max_in_flight[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_endpoint_id_concurrent(device_netbox, requests):
+    device = EndpointId(
+        device_netbox, device_netbox.base_url, "/dcim/devices/", {"id": 1}
+    )
+
+    results = await device(
+        get=[{"brief": 1}, {"exclude": "config_context"}, {}],
+        execution="concurrent",
+    )
+
+    assert len(results) == 3
+    assert [r.url.params.get("brief") for r in requests] == ["1", None, None]
+    assert device_netbox.max_in_flight[1] == 3
+
+
+@pytest.mark.asyncio
+async def test_endpoint_id_batch(device_netbox, requests):
+    device = EndpointId(
+        device_netbox, device_netbox.base_url, "/dcim/devices/", {"id": 1}
+    )
+
+    results = await device(
+        patch=[{"name": "a", "serial": "1"}, {"name": "b"}],
+        get={},
+        execution="batch",
+    )
+
+    assert [r.method for r in requests] == ["PATCH", "GET"]
+    assert json.loads(requests[0].content) == {"id": 1, "name": "b", "serial": "1"}
+    assert results[0].name == "b"
+    assert len(results) == 2
+
+
+@pytest.mark.asyncio
+async def test_endpoint_id_execution_exceptions(device_netbox):
+    device = EndpointId(
+        device_netbox, device_netbox.base_url, "/dcim/devices/", {"id": 1}
+    )
+
+    with pytest.raises(ValueError):
+        await device(get={}, execution="parallel")
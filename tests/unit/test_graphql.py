@@ -0,0 +1,112 @@
+import json
+
+import httpx
+import pytest
+
+from anac import api, GraphQLError, Metrics, RetryPolicy
+from anac.core.endpoint import DictAttribute
+
+
+DEVICES = [
+    {
+        "id": str(i),
+        "name": f"device{i}",
+        "interfaces": [
+            {"name": "eth0", "ip_addresses": [{"address": f"10.0.0.{i}/24"}]}
+        ],
+    }
+    for i in range(1, 26)
+]
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def graphql_api(requests):
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        if "broken" in body["query"]:
+            return httpx.Response(
+                200, json={"data": None, "errors": [{"message": "Syntax Error"}]}
+            )
+        variables = body["variables"]
+        offset = variables.get("offset", 0)
+        limit = variables.get("limit", len(DEVICES))
+        return httpx.Response(
+            200, json={"data": {"device_list": DEVICES[offset : offset + limit]}}
+        )
+
+    return api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_graphql(graphql_api, requests):
+    query = "query ($name: [String]) { device_list(name: $name) { name } }"
+    data = await graphql_api.graphql(query, variables={"name": ["device1"]})
+
+    assert isinstance(data, DictAttribute)
+    assert data.device_list[0].interfaces[0].ip_addresses[0].address == "10.0.0.1/24"
+    assert str(requests[0].url) == "https://demo.netbox.dev/graphql/"
+    assert requests[0].method == "POST"
+    assert requests[0].headers["authorization"] == "Token test_token"
+    assert json.loads(requests[0].content) == {
+        "query": query,
+        "variables": {"name": ["device1"]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_graphql_errors(graphql_api):
+    with pytest.raises(GraphQLError, match="Syntax Error"):
+        await graphql_api.graphql("{ broken }")
+
+
+@pytest.mark.asyncio
+async def test_graphql_retry_and_hooks(requests):
+    metrics = Metrics()
+    responses = [httpx.Response(503), httpx.Response(200, json={"data": {"a": 1}})]
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(backoff_factor=0),
+        hooks=[metrics],
+    )
+
+    assert (await a.graphql("{ a }")).a == 1
+    assert len(requests) == 2
+    assert metrics.summary()["/graphql/"]["retries"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit, concurrency", [(1, 4), (7, 2), (25, 1), (100, 4)])
+async def test_graphql_all(graphql_api, requests, limit, concurrency):
+    query = (
+        "query ($offset: Int!, $limit: Int!)"
+        " { device_list(offset: $offset, limit: $limit) { name } }"
+    )
+    devices = await graphql_api.graphql_all(query, limit=limit, concurrency=concurrency)
+
+    assert [d.name for d in devices] == [d["name"] for d in DEVICES]
+    assert all(isinstance(d, DictAttribute) for d in devices)
+    pages = len(DEVICES) // limit + 1
+    assert len(requests) == -(-pages // concurrency) * concurrency
+
+
+@pytest.mark.asyncio
+async def test_graphql_all_exceptions(graphql_api):
+    with pytest.raises(ValueError):
+        await graphql_api.graphql_all("{ device_list { name } }", limit=0)
@@ -0,0 +1,86 @@
+import json
+import random
+
+import pytest
+
+from anac.core.jsonstream import ResultsParser
+
+
+RESULTS = [
+    {"id": 1, "name": "device1", "tags": [], "site": {"id": 1, "slug": "a"}},
+    {"id": 2, "name": 'a "quoted" [name] {x}', "comments": '\\ \\" ]'},
+    {"id": 3, "custom_fields": {"list": [[1, 2], {"a": None}]}},
+]
+BODY = json.dumps(
+    {"count": 3, "next": None, "results": RESULTS, "previous": "]"}, indent=2
+).encode()
+
+
+def parse(body, size):
+    parser = ResultsParser(json.loads)
+    results = []
+    for i in range(0, len(body), size):
+        results.extend(parser.feed(body[i : i + size]))
+    return results, parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13, 64, len(BODY)])
+def test_results_parser(size):
+    results, meta = parse(BODY, size)
+
+    assert results == RESULTS
+    assert meta == {"count": 3, "next": None, "previous": "]"}
+
+
+def test_results_parser_random_chunks():
+    rng = random.Random(0)
+    for _ in range(50):
+        parser = ResultsParser(json.loads)
+        results = []
+        i = 0
+        while i < len(BODY):
+            size = rng.randint(1, 40)
+            results.extend(parser.feed(BODY[i : i + size]))
+            i += size
+
+        assert results == RESULTS
+        assert parser.close()["count"] == 3
+
+
+def test_results_parser_incremental():
+    parser = ResultsParser(json.loads)
+
+    assert list(parser.feed(b'{"count": 2, "results": [{"id": 1}, {"i')) == [{"id": 1}]
+    assert list(parser.feed(b'd": 2}]')) == [{"id": 2}]
+    assert list(parser.feed(b"}")) == []
+    assert parser.close() == {"count": 2}
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"results": [], "count": 0}', b'{"count": 0, "results": []}']
+)
+def test_results_parser_empty(body):
+    assert parse(body, 4) == ([], {"count": 0})
+
+
+@pytest.mark.parametrize("body", [b'{"count": 1}', b'{"results": [{"id": 1}'])
+def test_results_parser_exceptions(body):
+    with pytest.raises(json.JSONDecodeError):
+        parse(body, 4)
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [(b'{"count": 1}', "Expecting 'results' key"), (b'{"results": [{"i', "Incomplete")],
+)
+def test_results_parser_truncated(body, message):
+    def loads(content):
+        if not content:
+            raise TypeError("empty content")
+        return json.loads(content)
+
+    parser = ResultsParser(loads)
+    list(parser.feed(body))
+
+    with pytest.raises(json.JSONDecodeError, match=message):
+        parser.close()
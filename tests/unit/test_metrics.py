@@ -0,0 +1,123 @@
+import httpx
+import pytest
+
+from anac import api, Metrics, OpenTelemetryHook, RetryPolicy
+from anac.core.endpoint import Endpoint
+from anac.core.metrics import percentile
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def anac_api(events, mocker):
+    mocker.patch("anac.core.retry.asyncio.sleep")
+    responses = {
+        "GET": [httpx.Response(503, json={}), httpx.Response(200, json={"id": 1})],
+        "PATCH": [httpx.Response(200, json={"id": 1, "name": "test"})],
+        "DELETE": [httpx.Response(204)],
+    }
+
+    def handler(request):
+        return responses[request.method].pop(0)
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(),
+        hooks=[events.append],
+    )
+    a.dcim_devices_id = Endpoint(a, a.base_url, "/dcim/devices/{id}/")
+    return a
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([0.5], 99) == 0.5
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_hooks(anac_api, events):
+    device = await anac_api.dcim_devices_id(get={"id": 1})
+    await anac_api.dcim_devices_id(patch={"id": 1, "name": "test"})
+    await anac_api.dcim_devices_id(delete={"id": 1})
+
+    assert device.id == 1
+    get, patch, delete = events
+    assert (get.endpoint, get.method, get.status) == ("/dcim/devices/{id}/", "GET", 200)
+    assert get.retries == 1
+    assert get.bytes_in == len(b'{"id": 1}')
+    assert get.bytes_out == 0
+    assert get.decode_time is not None
+    assert get.latency > 0
+    assert patch.bytes_out > 0 and patch.retries == 0
+    assert delete.status == 204 and delete.decode_time is None
+
+
+@pytest.mark.asyncio
+async def test_hooks_error(events):
+    def handler(request):
+        raise httpx.ConnectError("Connection refused")
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        hooks=[events.append],
+    )
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+
+    with pytest.raises(httpx.ConnectError):
+        await a.dcim_devices(get={})
+    assert events[0].status is None
+    assert isinstance(events[0].error, httpx.ConnectError)
+
+
+@pytest.mark.asyncio
+async def test_metrics(anac_api):
+    metrics = Metrics()
+    anac_api.hooks = [metrics]
+
+    await anac_api.dcim_devices_id(get={"id": 1})
+    await anac_api.dcim_devices_id(patch={"id": 1, "name": "test"})
+
+    summary = metrics.summary()["/dcim/devices/{id}/"]
+    assert summary["count"] == 2
+    assert summary["retries"] == 1
+    assert summary["errors"] == 0
+    assert 0 < summary["p50"] <= summary["p95"] <= summary["p99"]
+
+    metrics.clear()
+    assert metrics.summary() == {}
+
+
+@pytest.mark.asyncio
+async def test_opentelemetry_hook(anac_api):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter("test")
+    anac_api.hooks = [OpenTelemetryHook(meter)]
+
+    await anac_api.dcim_devices_id(get={"id": 1})
+
+    metrics = {
+        m.name: m
+        for rm in reader.get_metrics_data().resource_metrics
+        for sm in rm.scope_metrics
+        for m in sm.metrics
+    }
+    duration = metrics["http.client.duration"].data.data_points[0]
+    assert duration.count == 1
+    assert duration.attributes["http.route"] == "/dcim/devices/{id}/"
+    assert metrics["anac.retries"].data.data_points[0].value == 1
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+from anac import api, RateLimiter
+from anac.core.endpoint import Endpoint
+from anac.core.ratelimit import TokenBucket
+
+
+@pytest.fixture
+def monotonic(mocker):
+    return mocker.patch("anac.core.ratelimit.time.monotonic", return_value=100.0)
+
+
+@pytest.fixture
+def sleep(mocker):
+    return mocker.patch("anac.core.ratelimit.asyncio.sleep")
+
+
+def test_token_bucket(monotonic):
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert [bucket.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+
+    monotonic.return_value = 101.0
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_exceptions():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter(monotonic, sleep):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": 1})
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter(rate=100, burst=100, write_rate=2),
+    )
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+
+    await (await a.dcim_devices(get=[{"id": 1}] * 5)).run()
+    assert sleep.call_count == 0
+
+    await (await a.dcim_devices(patch=[{"id": 1}] * 3)).run()
+    assert [call.args[0] for call in sleep.call_args_list] == pytest.approx([0.5, 1.0])
+    assert len(requests) == 8
@@ -0,0 +1,97 @@
+import httpx
+import pytest
+
+from anac import api, RetryPolicy
+from anac.core.endpoint import Endpoint
+
+
+@pytest.fixture
+def sleep(mocker):
+    return mocker.patch("anac.core.retry.asyncio.sleep")
+
+
+def retry_api(responses, retry):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+        retry=retry,
+    )
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+    return a, requests
+
+
+@pytest.mark.asyncio
+async def test_retry(sleep):
+    retry = RetryPolicy(max_attempts=4)
+    a, requests = retry_api(
+        [
+            httpx.Response(503),
+            httpx.ReadError("Connection reset by peer"),
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, json={"id": 1, "name": "test"}),
+        ],
+        retry,
+    )
+    device = await a.dcim_devices(get={"name": "test"})
+
+    assert device.name == "test"
+    assert len(requests) == 4
+    assert (retry.retries, retry.give_ups) == (3, 0)
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert 0 <= delays[0] <= 0.5
+    assert 0 <= delays[1] <= 1.0
+    assert delays[2] == 7
+
+
+@pytest.mark.asyncio
+async def test_retry_give_up(sleep):
+    retry = RetryPolicy(max_attempts=2)
+    a, requests = retry_api(
+        [httpx.Response(502, json={}), httpx.Response(502, json={})], retry
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await a.dcim_devices(get={"name": "test"})
+    assert len(requests) == 2
+    assert (retry.retries, retry.give_ups) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_retry_exception_give_up(sleep):
+    retry = RetryPolicy(max_attempts=2)
+    a, _ = retry_api([httpx.ConnectError("error"), httpx.ConnectError("error")], retry)
+
+    with pytest.raises(httpx.ConnectError):
+        await a.dcim_devices(get={"name": "test"})
+    assert (retry.retries, retry.give_ups) == (1, 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("action", ["post", "patch"])
+async def test_retry_non_idempotent(sleep, action):
+    retry = RetryPolicy()
+    a, requests = retry_api([httpx.Response(503, json={})], retry)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await a.dcim_devices(**{action: {"name": "test"}})
+    assert len(requests) == 1
+    assert (retry.retries, retry.give_ups) == (0, 0)
+
+
+def test_retry_after_date():
+    retry = RetryPolicy(max_backoff=10)
+    response = httpx.Response(
+        503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    )
+
+    assert retry.backoff(1, response) == 0
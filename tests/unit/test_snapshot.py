@@ -0,0 +1,167 @@
+import sqlite3
+
+import httpx
+import pytest
+
+from anac import api, export_snapshot
+from anac.core.endpoint import Endpoint
+from anac.core.snapshot import flatten
+from tests.unit.test_endpoint import paginate
+
+DEVICES = [
+    {
+        "id": i,
+        "name": f"device{i}",
+        "site": {"id": i % 2 + 1, "url": "https://demo.netbox.dev/api/dcim/sites/1/"},
+        "status": {"value": "active", "label": "Active"},
+        "tags": [{"id": 1, "name": "tag1"}],
+        "serial": None if i < 20 else f"sn{i}",
+    }
+    for i in range(1, 26)
+]
+SITES = [{"id": i, "name": f"site{i}"} for i in (1, 2)]
+
+
+@pytest.fixture
+def anac_api():
+    def handler(request):
+        if request.url.path == "/api/dcim/sites/":
+            return paginate(request, SITES)
+        return paginate(request, DEVICES)
+
+    a = api("https://demo.netbox.dev", token="test_token")
+    a.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+    a.dcim_sites = Endpoint(a, a.base_url, "/dcim/sites/")
+    return a
+
+
+def test_flatten():
+    assert flatten(DEVICES[0]) == {
+        "id": 1,
+        "name": "device1",
+        "site_id": 2,
+        "status": "active",
+        "tags": '[{"id": 1, "name": "tag1"}]',
+        "serial": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite(anac_api, tmp_path):
+    path = tmp_path / "netbox.db"
+    counts = await export_snapshot(
+        [anac_api.dcim_devices, anac_api.dcim_sites], path, limit=10
+    )
+
+    assert counts == {"dcim_devices": 25, "dcim_sites": 2}
+    db = sqlite3.connect(path)
+    rows = db.execute(
+        "SELECT s.name, count(*) FROM dcim_devices d"
+        " JOIN dcim_sites s ON d.site_id = s.id GROUP BY s.name ORDER BY s.name"
+    ).fetchall()
+    assert rows == [("site1", 12), ("site2", 13)]
+    assert db.execute("SELECT serial FROM dcim_devices WHERE id = 25").fetchone() == (
+        "sn25",
+    )
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_export_parquet(anac_api, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    counts = await export_snapshot(
+        [anac_api.dcim_devices], tmp_path, output="parquet", limit=10
+    )
+
+    assert counts == {"dcim_devices": 25}
+    table = pq.read_table(tmp_path / "dcim_devices.parquet")
+    assert table.num_rows == 25
+    assert table.column("site_id").to_pylist()[:2] == [2, 1]
+    assert table.column("serial").to_pylist()[-1] == "sn25"
+
+
+def test_flatten_null_reference():
+    references = set()
+
+    assert flatten({"id": 1, "tenant": None}, references) == {"id": 1, "tenant": None}
+    assert flatten({"id": 2, "tenant": {"id": 7}}, references) == {
+        "id": 2,
+        "tenant_id": 7,
+    }
+    assert flatten({"id": 3, "tenant": None}, references) == {
+        "id": 3,
+        "tenant_id": None,
+    }
+
+
+@pytest.fixture
+def tenant_api():
+    devices = [
+        {"id": i, "tenant": None if i <= 10 else {"id": 7}, "comments": None}
+        for i in range(1, 21)
+    ]
+    a = api("https://demo.netbox.dev", token="test_token")
+    a.http_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: paginate(r, devices))
+    )
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+    return a
+
+
+@pytest.mark.asyncio
+async def test_export_sqlite_null_reference(tenant_api, tmp_path):
+    path = tmp_path / "netbox.db"
+    await export_snapshot([tenant_api.dcim_devices], path, limit=10)
+
+    db = sqlite3.connect(path)
+    columns = [c[1] for c in db.execute("PRAGMA table_info(dcim_devices)")]
+    assert columns == ["id", "tenant_id", "comments"]
+    rows = db.execute("SELECT id, tenant_id FROM dcim_devices ORDER BY id").fetchall()
+    assert rows == [(i, None if i <= 10 else 7) for i in range(1, 21)]
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_null_reference(tenant_api, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    await export_snapshot(
+        [tenant_api.dcim_devices], tmp_path, output="parquet", limit=10
+    )
+
+    table = pq.read_table(tmp_path / "dcim_devices.parquet")
+    assert table.column_names == ["id", "tenant_id", "comments"]
+    assert table.column("tenant_id").to_pylist() == [None] * 10 + [7] * 10
+    assert table.column("comments").null_count == 20
+
+
+@pytest.mark.asyncio
+async def test_export_parquet_type_change(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    devices = [
+        {"id": i, "position": i, "asset": i if i <= 10 else f"A{i}"}
+        for i in range(1, 21)
+    ]
+    a = api("https://demo.netbox.dev", token="test_token")
+    a.http_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: paginate(r, devices))
+    )
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+
+    counts = await export_snapshot(
+        [a.dcim_devices], tmp_path, output="parquet", limit=10
+    )
+
+    assert counts == {"dcim_devices": 20}
+    table = pq.read_table(tmp_path / "dcim_devices.parquet")
+    assert str(table.schema.field("asset").type) == "string"
+    assert table.column("asset").to_pylist() == [str(d["asset"]) for d in devices]
+    assert table.column("position").to_pylist() == [*range(1, 21)]
+
+
+@pytest.mark.asyncio
+async def test_export_exceptions(anac_api, tmp_path):
+    with pytest.raises(ValueError):
+        await export_snapshot([anac_api.dcim_devices], tmp_path, output="csv")
@@ -0,0 +1,71 @@
+import httpx
+import pytest
+
+from anac import api, RequestDataError, RequestParamsError
+from anac.core.endpoint import Endpoint
+from anac.core.template import compile_template, UrlTemplate
+
+
+def test_url_template():
+    base_url = "https://demo.netbox.dev/api"
+
+    assert UrlTemplate("/dcim/devices/").format(base_url, {}) == (
+        "https://demo.netbox.dev/api/dcim/devices/"
+    )
+    assert UrlTemplate("/dcim/devices/{id}/napalm/").format(base_url, {"id": 1}) == (
+        "https://demo.netbox.dev/api/dcim/devices/1/napalm/"
+    )
+    assert UrlTemplate("/plugins/{app}/items/{slug}/").format(
+        base_url, {"app": "bgp", "slug": "test"}
+    ) == ("https://demo.netbox.dev/api/plugins/bgp/items/test/")
+    assert UrlTemplate("/plugins/{app}/items/{slug}/").params == ("app", "slug")
+    assert compile_template("/dcim/sites/{id}/") is compile_template(
+        "/dcim/sites/{id}/"
+    )
+
+
+@pytest.mark.parametrize("values", [{}, {"slug": 1}, None, [{"id": 1}]])
+def test_url_template_exceptions(values):
+    with pytest.raises((KeyError, TypeError)):
+        UrlTemplate("/dcim/sites/{id}/").format("", values)
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def anac_api(requests):
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": 1})
+
+    a = api(
+        "https://demo.netbox.dev",
+        token="test_token",
+        transport=httpx.MockTransport(handler),
+    )
+    a.ipam_prefixes_id_available_ips = Endpoint(
+        a, a.base_url, "/ipam/prefixes/{id}/available-ips/"
+    )
+    a.plugins_items = Endpoint(a, a.base_url, "/plugins/{app}/items/{slug}/")
+    return a
+
+
+@pytest.mark.asyncio
+async def test_path_params(anac_api, requests):
+    await anac_api.ipam_prefixes_id_available_ips(post={"id": 5, "description": "a"})
+    await anac_api.plugins_items(get={"app": "bgp", "slug": "test"})
+
+    assert requests[0].url.path == "/api/ipam/prefixes/5/available-ips/"
+    assert requests[1].url.path == "/api/plugins/bgp/items/test/"
+    assert requests[1].headers["authorization"] == "Token test_token"
+
+
+@pytest.mark.asyncio
+async def test_path_params_exceptions(anac_api):
+    with pytest.raises(RequestDataError, match='object id in the {"id": 1} format'):
+        await anac_api.ipam_prefixes_id_available_ips(post={"description": "a"})
+    with pytest.raises(RequestParamsError, match="object slug"):
+        await anac_api.plugins_items(get={"app": "bgp"})
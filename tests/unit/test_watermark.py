@@ -0,0 +1,120 @@
+import httpx
+import pytest
+
+from anac import (
+    api,
+    JSONWatermarkStore,
+    MemoryWatermarkStore,
+    SQLiteWatermarkStore,
+)
+from anac.core.endpoint import Endpoint
+from anac.core.watermark import latest, Watermark, watermark_key, WatermarkStore
+from tests.unit.test_endpoint import paginate
+
+
+@pytest.fixture(params=["memory", "json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return JSONWatermarkStore(tmp_path / "watermarks.json")
+    if request.param == "sqlite":
+        return SQLiteWatermarkStore(tmp_path / "watermarks.db")
+    return MemoryWatermarkStore()
+
+
+def test_store(store):
+    assert store.load("/dcim/devices/?") is None
+
+    store.save("/dcim/devices/?", Watermark("2021-01-01T00:00:00Z", [1, 2]))
+    store.save("/dcim/sites/?", Watermark("2021-01-02T00:00:00Z"))
+    store.save("/dcim/devices/?", Watermark("2021-01-03T00:00:00Z", [1]))
+
+    assert store.load("/dcim/devices/?") == Watermark("2021-01-03T00:00:00Z", [1])
+    assert store.load("/dcim/sites/?") == Watermark("2021-01-02T00:00:00Z")
+
+
+def test_store_persistence(tmp_path):
+    JSONWatermarkStore(tmp_path / "w.json").save("a", Watermark("t", [1]))
+    SQLiteWatermarkStore(tmp_path / "w.db").save("a", Watermark("t", [1]))
+
+    assert JSONWatermarkStore(tmp_path / "w.json").load("a") == Watermark("t", [1])
+    assert SQLiteWatermarkStore(tmp_path / "w.db").load("a") == Watermark("t", [1])
+
+
+def test_store_abstract():
+    with pytest.raises(TypeError):
+        WatermarkStore()
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        (["2021-01-01T00:00:00.5Z", "2021-01-01T00:00:00Z"], "2021-01-01T00:00:00.5Z"),
+        (
+            ["2021-01-01T01:30:00+02:00", "2021-01-01T00:00:00Z"],
+            "2021-01-01T00:00:00Z",
+        ),
+        ([None, "2021-01-01T00:00:00", ""], "2021-01-01T00:00:00"),
+        ([None], None),
+    ],
+)
+def test_latest(values, expected):
+    assert latest(values) == expected
+
+
+def test_watermark_key():
+    assert watermark_key("/dcim/devices/", {}) == "/dcim/devices/?"
+    assert (
+        watermark_key("/dcim/devices/", {"status": "active", "site": ["a", "b"]})
+        == "/dcim/devices/?site=a&site=b&status=active"
+    )
+
+
+@pytest.mark.asyncio
+async def test_changes(store):
+    devices = {
+        i: {"id": i, "name": f"device{i}", "last_updated": f"2021-01-0{i}T00:00:00Z"}
+        for i in range(1, 6)
+    }
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        since = request.url.params.get("last_updated__gte", "")
+        objects = [d for d in devices.values() if d["last_updated"] >= since]
+        if request.url.params.get("brief"):
+            objects = [{"id": d["id"]} for d in objects]
+        return paginate(request, objects)
+
+    a = api("https://demo.netbox.dev", token="test_token")
+    a.http_session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    a.dcim_devices = Endpoint(a, a.base_url, "/dcim/devices/")
+
+    changes = await a.dcim_devices.changes(store, reconcile=True)
+
+    assert [d.id for d in changes.objects] == [1, 2, 3, 4, 5]
+    assert changes.deleted == []
+    assert changes.watermark == Watermark("2021-01-05T00:00:00Z", [1, 2, 3, 4, 5])
+    assert "last_updated__gte" not in requests[0].url.params
+
+    del devices[2]
+    devices[3]["last_updated"] = "2021-01-07T00:00:00Z"
+    changes = await a.dcim_devices.changes(store, reconcile=True)
+
+    assert [d.id for d in changes.objects] == [3, 5]
+    assert changes.deleted == [2]
+    assert store.load("/dcim/devices/?").last_updated == "2021-01-07T00:00:00Z"
+    assert requests[-2].url.params["last_updated__gte"] == "2021-01-05T00:00:00Z"
+
+    del devices[4]
+    devices[6] = {"id": 6, "name": "device6", "last_updated": "2021-01-08T00:00:00Z"}
+    changes = await a.dcim_devices.changes(store)
+
+    assert [d.id for d in changes.objects] == [3, 6]
+    assert changes.deleted == []
+    # the ids are kept for the next reconcile
+    assert changes.watermark.ids == [1, 3, 4, 5, 6]
+
+    changes = await a.dcim_devices.changes(store, reconcile=True)
+
+    assert changes.deleted == [4]
+    assert changes.watermark.ids == [1, 3, 5, 6]